@@ -0,0 +1,54 @@
+"""
+Shared pytest configuration for the test scripts of the gallery and the
+validation suite.
+
+Pass ``--timings PATH`` to record the wall time and outcome of every test
+case in a JSON file, so that slow cases and speed regressions can be traced
+to a single integrator, element or example. Test cases may be distributed
+over processes with pytest-xdist (``-n auto``); the timings are collected by
+the controlling process.
+
+pytest only reads this file when it is run from the repository root (or
+``content/``), for example:
+
+    python -m pytest -n auto --import-mode=importlib --timings timings.json \\
+        content/validation/Basic/test_newmark.py \\
+        content/en/examples/NewmarkFamily/test_newmark.py
+
+``--import-mode=importlib`` is needed when collecting test files that share
+a name, such as the two ``test_newmark.py`` above.
+"""
+import json
+import platform
+from pathlib import Path
+
+
+_TIMINGS = {}
+
+
+def pytest_addoption(parser):
+    parser.addoption("--timings", metavar="PATH", default=None,
+                     help="write the wall time of each test case to a JSON file")
+
+
+def pytest_runtest_logreport(report):
+    # Called in the controlling process for every phase of every test,
+    # including those run by xdist workers
+    if report.when == "call" or (report.when == "setup" and report.outcome != "passed"):
+        _TIMINGS[report.nodeid] = {
+            "duration": report.duration,
+            "outcome":  report.outcome,
+        }
+
+
+def pytest_sessionfinish(session):
+    path = session.config.getoption("--timings")
+    if path is None or hasattr(session.config, "workerinput"):
+        return
+
+    report = {
+        "python":   platform.python_version(),
+        "machine":  platform.machine(),
+        "tests":    dict(sorted(_TIMINGS.items())),
+    }
+    Path(path).write_text(json.dumps(report, indent=2) + "\n")
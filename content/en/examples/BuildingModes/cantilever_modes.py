@@ -1,3 +1,5 @@
+import sys
+from pathlib import Path
 # Import the opensees package for finite element analysis
 import opensees.openseespy as ops
 # Import some additional dependencies
@@ -5,6 +7,11 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+# Import the eigenvalue solver shared by the examples
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]/"Library"))
+import modes
+import participation
+
 plt.rcParams.update({'font.size': 16})
 
 def make_model():
@@ -63,9 +70,16 @@ def plot_modes(model, numFloors, floorHeight):
 
     # Perform eigenvalue analysis
     # Eigenvalue analysis is performed to obtain the 
-    # first three natural frequencies and associated mode shapes
+    # first three natural frequencies and associated mode shapes. Only these
+    # modes are solved for, from the sparse stiffness and mass matrices with
+    # the massless rotations condensed out
     numEigen = 3
-    eigenValues = model.eigen(numEigen)
+    eigenValues, eigenVectors = modes.eigen(model, numEigen)
+
+    # Coordinates of all nodes as an (nn, 2) array, and the mode shapes as
+    # an (numEigen, nn, 3) array, ordered by node tag
+    nodeTags, coords = modes.node_coordinates(model)
+    shapes = modes.node_shapes(model, eigenVectors, nodeTags)
 
     # Plotting
     fig, ax = plt.subplots(1, numEigen + 1, figsize=(15, 10), sharey=True, gridspec_kw={'wspace': 0.1})
@@ -77,13 +91,8 @@ def plot_modes(model, numFloors, floorHeight):
     for fp, fl in zip(floor_positions, floor_labels):
         print(f'Floor Position: {fp} - Floor Label: {fl}')
 
-    # Plot undeformed shape
-    for i in range(numFloors):
-        nodeTag_i = i + 1
-        nodeTag_j = i + 2
-        coord_i = model.nodeCoord(nodeTag_i) # Get the coordinates of the i-th node
-        coord_j = model.nodeCoord(nodeTag_j) # Get the coordinates of the j-th node
-        ax[0].plot([coord_i[0], coord_j[0]], [coord_i[1], coord_j[1]], 'b-o')
+    # Plot undeformed shape; the columns join consecutive nodes
+    ax[0].plot(coords[:, 0], coords[:, 1], 'b-o')
 
     ax[0].set_title('Undeformed Shape')
     ax[0].set_xlabel('X')
@@ -91,32 +100,14 @@ def plot_modes(model, numFloors, floorHeight):
     ax[0].set_yticks(floor_positions)
     ax[0].set_yticklabels(floor_labels)  # Adjust fontsize as needed
 
+    # Scale deformation to the node coordinates for easy visualization
+    scaleFactor = 15  # Scale factor for deformation amplification
+    displaced = coords[:, 0] + scaleFactor * shapes[:, :, 0]
+
     # Plot mode shapes
-    all_modal_displacements = {}
     for mode in range(numEigen):
-        for i in range(numFloors):
-            nodeTag_i = i + 1
-            nodeTag_j = i + 2
-            coord_i = model.nodeCoord(nodeTag_i) # Get the coordinates of the i-th node
-            coord_j = model.nodeCoord(nodeTag_j) # Get the coordinates of the j-th node
-            ax[mode + 1].plot([coord_i[0], coord_j[0]], [coord_i[1], coord_j[1]], '-o', color='gray')
-
-        # get modal displacement and floor number for each node
-        all_modal_displacements[mode] = {}
-        # Scale deformation to the node coordinates for easy visualization
-        scaleFactor = 15  # Scale factor for deformation amplification
-        for i in range(numFloors):
-            nodeTag_i = i + 1
-            nodeTag_j = i + 2
-            coord_i = model.nodeCoord(nodeTag_i)
-            coord_j = model.nodeCoord(nodeTag_j)
-            eigenvector_i = model.nodeEigenvector(nodeTag_i, mode + 1)
-            eigenvector_j = model.nodeEigenvector(nodeTag_j, mode + 1)
-            # Apply scale factor to mode shape
-            coord_i[0] += scaleFactor * eigenvector_i[0]
-            coord_j[0] += scaleFactor * eigenvector_j[0]
-            all_modal_displacements[mode][nodeTag_i] = coord_i[0]
-            ax[mode + 1].plot([coord_i[0], coord_j[0]], [coord_i[1], coord_j[1]], 'r-o')
+        ax[mode + 1].plot(coords[:, 0], coords[:, 1], '-o', color='gray')
+        ax[mode + 1].plot(displaced[mode], coords[:, 1], 'r-o')
         print(f'Mode {mode + 1} - Frequency: {np.sqrt(eigenValues[mode]) / (2 * np.pi)} Hz')
 
         # print(f'Modal Displacements: {modalDisplacements}')
@@ -145,9 +136,15 @@ def plot_modes(model, numFloors, floorHeight):
     plt.savefig('mode_shapes.png', dpi=300, bbox_inches='tight')
     plt.close()
 
-    # print(all_modal_displacements)
-    ## all_modal_displacements to pandas dataframe
-    df = pd.DataFrame(all_modal_displacements)
+    # Participation factors and effective masses of the plotted modes, and
+    # the number of modes needed to capture 90% of the mass
+    print(participation.modal_properties(model, numEigen))
+    numRequired, _ = participation.required_modes(model, 0.9)
+    print(f'{numRequired} modes are needed to reach 90% of the mass')
+
+    ## displaced coordinates of each floor (excluding the roof) for each
+    ## mode, to pandas dataframe
+    df = pd.DataFrame(displaced[:, :numFloors].T, index=nodeTags[:numFloors])
     # print(df.head())
 
     ## ylocations for each mode
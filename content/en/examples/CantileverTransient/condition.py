@@ -5,7 +5,10 @@ import numpy as np
 # import the openseespy interface which contains the "Model" class
 import opensees.openseespy as ops
 import opensees.section
-import quakeio
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]/"Library"))
+from records import load_record
 
 
 ## Configure units
@@ -89,9 +92,7 @@ def steel_cantilever(small_mass = 1e-4, hardening=0.1, damping=None):
 # #### Perform integration
 def analyze(model, form, init="a", alpha=None, n=None):
 
-    Event = quakeio.read("TAK000.AT2")
-    AccHst = Event.data
-    Deltat = Event["time_step"]
+    Deltat, _, AccHst = load_record("TAK000.AT2")
 
 
     load_tag = 1
@@ -1,8 +1,17 @@
+import sys
+from pathlib import Path
 import numpy as np
+import scipy.linalg
+import scipy.sparse
+import scipy.sparse.linalg
 from math import cos,sin,sqrt,pi
 import opensees.openseespy as ops
 from opensees.units.iks import gravity
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]/"Library"))
+import modes
+import participation
+
 def create_model():
     # Eigen analysis of a two-storey one-bay frame
     # Example 10.5 from "Dynamics of Structures" by Anil Chopra
@@ -68,91 +77,245 @@ def find_mass(model, ndf=3, tol=0.0):
                 if abs(model.nodeMass(nd,j+1)) > tol
         ]
 
-def condense(K, ic=None, model=None, tol=0.0):
-    N = K.shape[0]
-
-
-    ic = np.array(ic)
-
-    if len(ic.shape) > 1:
-        ic = np.array([model.nodeDOF(*i) for i in ic], dtype=int)
-
-
-    ix = np.setdiff1d(range(N), ic)
+class Condensation:
+    """
+    Static condensation of a stiffness matrix onto the DOFs ``ic``.
+
+    The matrix is partitioned once, and the block of the condensed-out DOFs
+    is factored once (by Cholesky, an LU decomposition if it is not
+    positive definite, or a sparse LU for sparse input). The resulting
+    transformation ``T = [I; -inv(Knn)*Knm]`` is kept, so that the condensed
+    stiffness ``T'*K*T``, or any other matrix reduced by the same ``T``, can
+    be formed any number of times without solving again.
+
+    Parameters:
+        K: Stiffness matrix, dense or ``scipy.sparse``.
+        ic: DOFs to keep, as equation numbers or as (node, dof) pairs. By
+            default, the DOFs of ``model`` with a mass larger than ``tol``.
+    """
+    def __init__(self, K, ic=None, model=None, tol=0.0):
+        N = K.shape[0]
+
+        if ic is None:
+            ic = find_mass(model, tol=tol)
+
+        ic = np.asarray(ic, dtype=int)
+
+        if ic.ndim > 1:
+            ic = np.array([model.nodeDOFs(nd)[dof-1] for nd, dof in ic], dtype=int)
+
+        ix = np.setdiff1d(np.arange(N), ic)
+        self.ic, self.ix = ic, ix
+        self.sparse = scipy.sparse.issparse(K)
+
+        if self.sparse:
+            K = scipy.sparse.csc_array(K)
+            Knn = K[ix, :][:, ix]
+            Knm = K[ix, :][:, ic].toarray()
+        else:
+            K = np.asarray(K)
+            Knn = K[np.ix_(ix, ix)]
+            Knm = K[np.ix_(ix, ic)]
+
+        # Factor Knn once
+        if len(ix) == 0:
+            solve_nn = None
+        elif self.sparse:
+            solve_nn = scipy.sparse.linalg.splu(Knn).solve
+        else:
+            solve_nn = _factor(Knn)
+
+        # Transformation from the kept DOFs to all DOFs
+        T = np.zeros((N, len(ic)))
+        T[ic, np.arange(len(ic))] = 1.0
+        if len(ix) > 0:
+            T[ix, :] = -solve_nn(Knm)
+        self.T = T
+
+        self.K = self.condense(K)
+        self._solve = None
+
+    def condense(self, A):
+        """
+        Return ``T'*A*T``, the matrix ``A`` (such as a damping or mass matrix)
+        reduced to the kept DOFs.
+        """
+        return self.T.T @ (A @ self.T)
+
+    def expand(self, u):
+        """
+        Return the displacements of all DOFs from those ``u`` of the kept DOFs.
+        """
+        return self.T @ u
+
+    def solve(self, f):
+        """
+        Return the displacements of the kept DOFs under the loads ``f`` on
+        them, from the condensed stiffness; ``expand`` gives those of all
+        DOFs. The condensed stiffness is factored on the first call.
+        """
+        if self._solve is None:
+            self._solve = _factor(np.asarray(self.K))
+        return self._solve(f)
+
+
+def _factor(A):
+    # Return a function solving A*x = b, by Cholesky if A is positive
+    # definite and by LU otherwise
+    try:
+        factor = scipy.linalg.cho_factor(A)
+        return lambda b: scipy.linalg.cho_solve(factor, b)
+    except np.linalg.LinAlgError:
+        factor = scipy.linalg.lu_factor(A)
+        return lambda b: scipy.linalg.lu_solve(factor, b)
 
-    # Static condensation
-    Kmm = K[ic,:][:,ic]
-    Kmn = K[ic,:][:,ix]
-    Knm = K[ix,:][:,ic]
-    Knn = K[ix,:][:,ix]
 
+def condense(K, ic=None, model=None, tol=0.0):
     # Kc = Kmm - Kmn*inv(Knn)*Knm
-    if len(ix) > 0:
-        Kc = Kmm - Kmn@np.linalg.solve(Knn,Knm)
-    else:
-        Kc = K
-
-    return Kc
+    return Condensation(K, ic, model, tol).K
 
 
-def state_space(M, C, K, im=None, model=None):
+def state_space(M, C, K, im=None, model=None, condensation=None):
     #   https://portwooddigital.com/2020/05/17/gimme-all-your-damping-all-your-mass-and-stiffness-too/
+    """
+    Return the sparse matrices B and D of the first-order form D*x = -lam*B*x
+    of the equations of motion, with x = [lam*u; u] over the DOFs ``im``
+    that have mass. The other DOFs are condensed out of K, while M and C
+    are taken at the DOFs with mass, so that damping coupled to the
+    massless DOFs (such as stiffness-proportional damping of rotations)
+    is left out, as in a lumped-mass model.
+    """
 
     # Determine number of DOFs with mass
     if im is None:
         im = find_mass(model)
 
-    nm = len(im)
-
-    # Form matrices for D*x = -lam*B*x
-    B = np.zeros((2*nm,2*nm)) # = [ 0 M; M C]
-    D = np.zeros((2*nm,2*nm)) # = [-M 0; 0 K]
-
-    # Mass
-    B[:nm,:][:,nm:2*nm] =  M[im,:][:,im]
-    B[nm:2*nm,:][:,:nm] =  M[im,:][:,im]
-    D[:nm,:][:,:nm]     = -M[im,:][:,im]
-
-    # Damping
-    B[nm:2*nm,:][:,nm:2*nm] = C[im,:][:,im]
+    # Stiffness at DOFs with mass; pass the same condensation to every
+    # build that shares K, such as in a parametric study of the damping
+    if condensation is None:
+        condensation = Condensation(K, ic=im)
 
-    # Stiffness at DOFs with mass
+    ic = condensation.ic
+    Mc = scipy.sparse.csc_array(M)[ic, :][:, ic]
+    Cc = scipy.sparse.csc_array(C)[ic, :][:, ic]
+    Kc = scipy.sparse.csc_array(condensation.K)
 
-    Kc = condense(K, ic=im)
-    D[nm:2*nm,:][:,nm:2*nm] = Kc
-
-
-
-def eigen_analysis(model):
-
-    # record eigenvectors
-    #----------------------
-    for k in range(1, numModes+1):
-        model.recorder("Node", f"eigen {k}", file=f"modes/mode{k}.out", 
-                       nodeRange=[1, 6], dof=[1, 2, 3]
-        )
+    # Form matrices for D*x = -lam*B*x
+    B = scipy.sparse.block_array([[None, Mc], [Mc,   Cc]], format="csc") # = [ 0 M; M C]
+    D = scipy.sparse.block_array([[ -Mc, None], [None, Kc]], format="csc") # = [-M 0; 0 K]
+
+    return B, D
+
+
+def complex_modes(M, C, K, n, im=None, model=None, condensation=None, sigma=0.0, tol=1e-6):
+    """
+    Complex modal analysis of a model with non-classical damping.
+
+    The eigenvalues ``lam`` of ``(lam^2*M + lam*C + K)*u = 0`` closest to
+    ``sigma`` are found from the state-space form of ``state_space`` with
+    the shift-invert Arnoldi method, and the first ``n`` modes, in order of
+    natural frequency, are returned with one eigenvalue each.
+
+    An eigenvalue whose imaginary part is within ``tol`` times its absolute
+    value of zero is taken as real. An underdamped mode is a complex
+    conjugate pair, and is reported by the eigenvalue with positive
+    imaginary part. An overdamped mode is a pair of real eigenvalues whose
+    product is omega^2, and is reported by the one of smaller magnitude;
+    omega is found from the stiffness and mass of its mode shape. A model
+    with a rigid-body mode (a zero eigenvalue) raises a ValueError.
+
+    Returns:
+        lam: Eigenvalues ``-zeta*omega + omega*sqrt(zeta^2-1)``, complex for
+             underdamped modes, whose absolute values are the natural
+             frequencies omega, and real for overdamped modes.
+        zeta: Damping ratios, greater than one for overdamped modes.
+        shapes: Complex mode shapes over all DOFs, as columns.
+    """
+    if im is None:
+        im = find_mass(model)
 
-    # number of modes
-    numModes = 2
+    if condensation is None:
+        condensation = Condensation(K, ic=im)
+
+    B, D = state_space(M, C, K, im=im, condensation=condensation)
+    N = B.shape[0]
+    h = N//2
+    Mc, Kc = B[:h, h:], D[h:, h:]
+
+    # Every mode has two eigenvalues. The fast root of an overdamped mode
+    # may lie far from sigma, so a few more are computed than needed, and
+    # all of them if that still does not give n modes.
+    k = 2*n + 2
+    while True:
+        if k < N - 1:
+            # Eigenvalues nu = 1/(sigma - lam) of inv(D + sigma*B)*B; those of
+            # largest magnitude are the lam closest to sigma
+            lu = scipy.sparse.linalg.splu(D + sigma*B)
+            OP = scipy.sparse.linalg.LinearOperator((N, N), matvec=lambda x: lu.solve(B @ x),
+                                                    dtype=float)
+            nu, x = scipy.sparse.linalg.eigs(OP, k=k, which="LM")
+            lam = sigma - 1/nu
+        else:
+            lam, x = scipy.linalg.eig(D.toarray(), -B.toarray())
+
+        # A zero eigenvalue is a rigid-body mode, which has no frequency or
+        # damping ratio
+        if np.any(abs(lam) <= tol*abs(lam).max()):
+            raise ValueError("Zero eigenvalue; complex_modes needs a model "
+                             "without rigid-body modes")
+
+        found = []
+        for i in range(len(lam)):
+            size = abs(lam[i])
+            if lam[i].imag > tol*size:
+                found.append((size, lam[i], -lam[i].real/size, i))
+            elif abs(lam[i].imag) <= tol*size:
+                # The shape of a real eigenvalue is real up to a phase
+                u = x[h:, i]
+                u = (u/u[np.argmax(abs(u))]).real
+                omega = np.sqrt((u @ (Kc @ u))/(u @ (Mc @ u)))
+                if size <= omega:
+                    zeta = (size**2 + omega**2)/(2*size*omega)
+                    found.append((omega, complex(lam[i].real), zeta, i))
+
+        if len(found) >= n or k >= N - 1:
+            break
+        k = min(2*k, N)
+
+    found = sorted(found, key=lambda mode: mode[0])[:n]
+    lam  = np.array([mode[1] for mode in found])
+    zeta = np.array([mode[2] for mode in found])
+    shapes = condensation.expand(x[h:, [mode[3] for mode in found]])
+    return lam, zeta, shapes
+
+
+def eigen_analysis(model, numModes=2):
 
     # perform eigen analysis
     #-----------------------------
-    lamda = model.eigen(numModes)
+    # Only the requested modes are found, from the sparse stiffness and
+    # mass matrices with the massless rotations condensed out
+    lamda, vectors = modes.eigen(model, numModes)
 
     # calculate frequencies and periods of the structure
     #---------------------------------------------------
-    omega = []
-    f = []
-    T = []
-    pi = 3.141593
+    omega = np.sqrt(lamda)
+    f = omega/(2*pi)
+    T = (2*pi)/omega
+
+    print(f"The periods are {T}")
 
-    for lam in lamda:
-        omega.append(sqrt(lam))
-        f.append( sqrt(lam)/(2*pi) )
-        T.append( (2*pi)/sqrt(lam) )
+    # participation factors and effective masses
+    #---------------------------------------------------
+    print(participation.modal_properties(model, numModes))
 
+    # eigenvectors at the floors, normalized by the roof
+    #---------------------------------------------------
+    floors = modes.dof_map(model, (3, 5))[:, 0]
+    for k in range(numModes):
+        print(f"eigenvector {k+1}: {vectors[floors, k]/vectors[floors[-1], k]}")
 
-    print(f"The periods are {T}")
+    return lamda, vectors
 
 
 def static_analysis(model):
@@ -0,0 +1,155 @@
+import numpy as np
+import scipy.linalg
+import scipy.sparse
+import pytest
+
+from dynamics import Condensation, state_space, complex_modes
+
+
+def frame_stiffness(n=6, seed=0):
+    # Symmetric positive definite stiffness of n DOFs
+    rng = np.random.default_rng(seed)
+    A = rng.standard_normal((n, n))
+    return A @ A.T + n*np.eye(n)
+
+
+@pytest.mark.parametrize("kind", ["cholesky", "lu", "sparse"])
+def test_condensation(kind):
+    K = frame_stiffness()
+    ic, ix = np.array([0, 2, 5]), np.array([1, 3, 4])
+    if kind == "lu":
+        # An indefinite (but regular) Knn cannot be factored by Cholesky
+        K[np.ix_(ix, ix)] -= 2*np.abs(np.linalg.eigvalsh(K[np.ix_(ix, ix)])).max()*np.eye(3)
+
+    condensation = Condensation(scipy.sparse.csc_array(K) if kind == "sparse" else K, ic=ic)
+
+    # Schur complement Kmm - Kmn*inv(Knn)*Knm
+    Kc = K[np.ix_(ic, ic)] - K[np.ix_(ic, ix)] @ np.linalg.solve(K[np.ix_(ix, ix)], K[np.ix_(ix, ic)])
+    assert np.allclose(condensation.K, Kc)
+
+    # Loads on the kept DOFs only
+    f = np.zeros((6, 2))
+    f[ic] = np.arange(6.0).reshape(3, 2) + 1
+    assert np.allclose(condensation.expand(condensation.solve(f[ic])), np.linalg.solve(K, f))
+
+
+def test_state_space():
+    # The mass and damping are taken at the DOFs with mass, and the
+    # stiffness is condensed
+    K = frame_stiffness()
+    im = np.array([0, 2, 5])
+    M = np.diag([1.0, 0, 2.0, 0, 0, 3.0])
+    C = 0.1*K
+
+    B, D = state_space(M, C, K, im=im)
+    Kc = Condensation(K, ic=im).K
+    nm = len(im)
+    assert np.allclose(B.toarray()[:nm, nm:], M[np.ix_(im, im)])
+    assert np.allclose(B.toarray()[nm:, nm:], C[np.ix_(im, im)])
+    assert np.allclose(D.toarray()[nm:, nm:], Kc)
+    assert np.allclose(D.toarray()[:nm, :nm], -M[np.ix_(im, im)])
+
+
+def shear_building(n, k=100.0, m=1.0):
+    # Stiffness and mass of an n-storey shear building fixed at its base
+    K = np.zeros((n, n))
+    K[0, 0] = k
+    for i in range(1, n):
+        K[i-1:i+1, i-1:i+1] += k*np.array([[1, -1], [-1, 1]])
+    return K, m*np.eye(n)
+
+
+def pencil_modes(M, C, K):
+    # Every eigenvalue of the full state-space pencil D*x = -lam*B*x
+    n = len(K)
+    Z = np.zeros((n, n))
+    B = np.block([[Z, M], [M, C]])
+    D = np.block([[-M, Z], [Z, K]])
+    return scipy.linalg.eigvals(D, -B)
+
+
+def sparse(*matrices):
+    return [scipy.sparse.csc_array(A) for A in matrices]
+
+
+@pytest.mark.parametrize("n", [3, 12])
+def test_complex_modes_rayleigh(n):
+    # Classical damping: the reported eigenvalues are those of the pencil
+    # with positive imaginary part, and the damping ratios are Rayleigh's
+    K, M = shear_building(n)
+    a0, a1 = 0.2, 0.004
+    C = a0*M + a1*K
+    modes_ = min(n, 4)
+
+    lam, zeta, shapes = complex_modes(*sparse(M, C, K), modes_, im=np.arange(n))
+
+    expected = pencil_modes(M, C, K)
+    expected = np.sort_complex(expected[expected.imag > 0])
+    expected = expected[np.argsort(abs(expected))][:modes_]
+    assert np.allclose(lam, expected)
+
+    omega = np.sqrt(scipy.linalg.eigvalsh(K, M))[:modes_]
+    assert np.allclose(zeta, a0/(2*omega) + a1*omega/2)
+
+    # The shapes are eigenvectors of the quadratic problem
+    for j in range(modes_):
+        residual = (lam[j]**2*M + lam[j]*C + K) @ shapes[:, j]
+        assert np.allclose(residual, 0, atol=1e-8*abs(lam[j])**2)
+
+
+@pytest.mark.parametrize("n", [4, 12])
+def test_complex_modes_dashpot(n):
+    # A dashpot at the first storey makes the damping non-classical; every
+    # conjugate pair of the pencil is reported once
+    K, M = shear_building(n)
+    C = np.zeros((n, n))
+    C[0, 0] = 2.0
+
+    lam, zeta, _ = complex_modes(*sparse(M, C, K), 3, im=np.arange(n))
+
+    expected = pencil_modes(M, C, K)
+    assert np.allclose(expected.imag[abs(expected.imag) > 1e-8].size, 2*n)
+    expected = expected[expected.imag > 0]
+    expected = expected[np.argsort(abs(expected))][:3]
+    assert np.allclose(lam, expected)
+    assert np.allclose(zeta, -lam.real/abs(lam))
+
+
+def test_complex_modes_overdamped():
+    # A heavy dashpot at the top of a two-storey building gives it an
+    # overdamped mode, whose two real eigenvalues are reported once, by
+    # the one of smaller magnitude
+    K, M = shear_building(2)
+    C = np.zeros((2, 2))
+    C[1, 1] = 200.0
+
+    lam, zeta, _ = complex_modes(*sparse(M, C, K), 2, im=np.arange(2))
+
+    expected = pencil_modes(M, C, K)
+    real = np.sort(expected[abs(expected.imag) < 1e-8].real)
+    pair = expected[expected.imag > 1e-8]
+    assert len(real) == 2 and len(pair) == 1
+
+    assert np.sum(np.isreal(lam)) == 1
+    assert np.isclose(lam[np.isreal(lam)][0].real, real[-1])
+    assert np.isclose(lam[~np.isreal(lam)][0], pair[0])
+    assert zeta[np.isreal(lam)][0] > 1 and zeta[~np.isreal(lam)][0] < 1
+
+    # For classical damping the damping ratio of the overdamped mode is exact
+    K, M = shear_building(3)
+    omega, phi = scipy.linalg.eigh(K, M)
+    omega = np.sqrt(omega)
+    ratios = np.array([0.05, 2.0, 0.05])
+    C = M @ phi @ np.diag(2*ratios*omega) @ phi.T @ M
+
+    lam, zeta, _ = complex_modes(*sparse(M, C, K), 3, im=np.arange(3))
+    assert np.allclose(zeta, ratios)
+    assert np.isclose(lam[1].real, -omega[1]*(2.0 - np.sqrt(3.0)))
+
+
+def test_complex_modes_rigid_body():
+    # A building on rollers has a zero eigenvalue
+    K, M = shear_building(3)
+    K[0, 0] -= 100.0
+    with pytest.raises(ValueError):
+        complex_modes(*sparse(M, 0.01*K, K), 2, im=np.arange(3))
@@ -14,13 +14,18 @@
 #   pushover_analysis(model, H) - perform pushover analysis
 #   dynamic_analysis(model) - perform dynamic analysis
 #
+import sys
+from pathlib import Path
 import opensees.openseespy as ops
 
-def eigen(model):
-    from scipy.linalg import eig
-    m = model.getTangent(m=1)
-    k = model.getTangent(k=1)
-    w, v = eig(k, m)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]/"Library"))
+import modes
+
+def eigen(model, n=2):
+    # Only the lowest n modes of the condensed, sparse problem are solved for;
+    # the dense eig this replaces returned every eigenvalue, including the
+    # infinite ones of the massless DOFs, in no particular order
+    w, v = modes.eigen(model, n)
     return w
 
 def create_portal(width  = 360.0, height = 144.0):
@@ -10,11 +10,17 @@
 #     |
 #    -o- -> tran
 #
+import sys
+from pathlib import Path
+from functools import lru_cache
 from math import cos,sin,sqrt,pi
 import numpy as np
 import scipy.optimize
 import opensees.openseespy as ops
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]/"Library"))
+from sweep import sweep
+
 # Effective length factors
 FACTORS = {
     "pin-pin":     1,
@@ -25,6 +31,9 @@ FACTORS = {
     "pin-roll":   2,
 }
 
+# The factor depends only on the boundary and phi, and for fix-pin columns
+# requires a root solve, so it is computed once per pair
+@lru_cache(maxsize=None)
 def buckle_factor(boundary, phi=0):
     if boundary == "pin-pin":
         return np.pi
@@ -197,11 +206,22 @@ def linearized_buckling(model, peak_load):
     model.analysis('Static')
 
 
-def buckling_analysis(model, peak_load):
+def buckling_analysis(model, peak_load, max_step=0.25, min_step=0.01, overshoot=0.05,
+                      tol=1e-4):
     # Apply a load from zero to peak_load until 
     # the stiffness becomes singular (first eigenvalue is zero)
+    #
+    # The load step is chosen by the secant through the last two values of
+    # the lowest eigenvalue, aiming a little past the load at which it is
+    # predicted to vanish, so that the critical load is bracketed in a few
+    # steps. Steps that fail to converge are bisected; one that still fails
+    # when halving it again would fall below min_step is taken as the end
+    # of the bracket, and its load as the limit load, as a failed step of
+    # the fixed load increments used before was.
+    #
+    # Returns the limit load, or None if none is found below PeakLoadRatio
+    # times peak_load, and whether every step converged.
 
-    load_step     = 0.01
     PeakLoadRatio = 1.50
 
     # Analysis Options
@@ -210,72 +230,87 @@ def buckling_analysis(model, peak_load):
 #   model.test('NormUnbalance', 1.0e-6, 20, 0)
     model.test("EnergyIncr", 1e-8, 20, 9)
     model.algorithm('Newton')
-    model.integrator('LoadControl', load_step)
+    model.integrator('LoadControl', max_step)
     model.analysis('Static')
 
 #   print(pd.DataFrame(model.getTangent()))
 
     lam_0 = model.getTime()
-    eig_0 = model.eigen(1)
+    eig_0 = model.eigen(1)[0]
 
-    limit_load = None
-    failed = False
-    for i in range(1, int(PeakLoadRatio/load_step)+1):
+    step = min(max_step, PeakLoadRatio)
+    while lam_0 < PeakLoadRatio:
+        model.integrator('LoadControl', step)
         if model.analyze(1) != 0:
-            print(f"  Analysis failed at step {i} with load at {model.getTime()}")
-            failed = True
-#           break
-
-        lam =  model.getTime()
-        eig =  model.eigen(1)[0]
-
-        if eig <= 0.0 or failed:
-            if eig_0 != eig:
-                # linear interpolation
-                lam_i = lam_0 + (lam - lam_0)*eig_0/(eig_0-eig)
-            else:
-                lam_i = lam
-
-            limit_load = lam_i * peak_load
-            break
-
-        lam_0 = lam
-        eig_0 = eig
-
-    return limit_load
-
-
-if __name__ == "__main__":
-
-    for ndm in 3,:
-        for elem in "PrismFrame", "MixedFrame", "ExactFrame":
-    #               "forceBeamColumn", "forceBeamColumnCBDI":
-            print(f"\n{elem:10}      Shear    Order     Theory   Computed       Error")
+            if step/2 < min_step:
+                return (lam_0 + step) * peak_load, False
+            step /= 2
+            continue
+
+        lam = model.getTime()
+        eig = model.eigen(1)[0]
+
+        if eig <= 0.0:
+            # linear interpolation within the bracket
+            return (lam_0 + (lam - lam_0)*eig_0/(eig_0 - eig)) * peak_load, True
+
+        if eig < eig_0:
+            # secant prediction of the load at which eig vanishes
+            lam_x = lam - eig*(lam - lam_0)/(eig - eig_0)
+            if lam_x - lam <= tol*lam_x:
+                return lam_x * peak_load, True
+            step = min(max_step, (1 + overshoot)*(lam_x - lam))
+        else:
+            step = max_step
 
+        step = max(min_step, min(step, PeakLoadRatio - lam))
+        lam_0, eig_0 = lam, eig
 
-            for boundary in FACTORS:
+    return None, True
 
-                orders = (0,2) if "Exact" not in elem else (1,)
 
-                for shear in False, True:
-                    for order in orders:
+def column_case(element, boundary, shear, order, ndm=3, transform="Corotational"):
+    elem_data = {
+        "type": element,
+        "shear": shear,
+        "order": order,
+        "transform": transform
+    }
 
-                        if not shear and "Exact" in elem:
-                            continue
+    model, euler_load  = create_column(boundary, elem_data, ndm=ndm)
+    limit_load, converged = buckling_analysis(model, euler_load)
 
-                        elem_data = {
-                            "type": elem,
-                            "shear": shear,
-                            "order": order,
-                            "transform": "Corotational"
-                        }
+    return {
+        "Theory":    euler_load,
+        "Computed":  limit_load,
+        "Error":     None if limit_load is None else 100*(limit_load/euler_load-1),
+        "Converged": converged
+    }
 
-                        model, euler_load  = create_column(boundary, elem_data, ndm=ndm)
-                        limit_load   = buckling_analysis(model, euler_load)
 
-                        print(f"  {boundary:10} {shear:8} {order:8} ", end="")
-                        if limit_load is None:
-                            print(f"No singularity found.")
-                        else:
-                            print(f"{euler_load:10.2f} {limit_load:10.2f} {100*(limit_load/euler_load-1):10.3f} %")
+if __name__ == "__main__":
 
+    elements = "PrismFrame", "MixedFrame", "ExactFrame"
+    #          "forceBeamColumn", "forceBeamColumnCBDI":
+
+    cases = [
+        dict(element=elem, boundary=boundary, shear=shear, order=order, ndm=ndm)
+        for ndm in (3,)
+            for elem in elements
+                for boundary in FACTORS
+                    for shear in (False, True)
+                        for order in ((0,2) if "Exact" not in elem else (1,))
+                            if shear or "Exact" not in elem
+    ]
+
+    results = sweep(column_case, cases, chunksize=4)
+
+    for elem in elements:
+        print(f"\n{elem:10}      Shear    Order     Theory   Computed       Error")
+        for row in results[results["element"] == elem].itertuples():
+            print(f"  {row.boundary:10} {row.shear:8} {row.order:8} ", end="")
+            if row.Computed is None or np.isnan(row.Computed):
+                print(f"No singularity found.")
+            else:
+                print(f"{row.Theory:10.2f} {row.Computed:10.2f} {row.Error:10.3f} %", end="")
+                print("" if row.Converged else "  (analysis failed at this load)")
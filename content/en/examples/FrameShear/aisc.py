@@ -1,9 +1,15 @@
 #
 # AISC Benchmark Problems
 #
+import sys
+from pathlib import Path
+from functools import partial
 from opensees.units.iks import ft, ksi
 from opensees.helpers import Prism
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]/"Library"))
+from sweep import sweep
+
 def check_case1(model, Mbench, Dbench, ndm):
     ne    = len(model.getEleTags())
     Axial = model.getTime()
@@ -11,9 +17,7 @@ def check_case1(model, Mbench, Dbench, ndm):
     u     = model.nodeDisp(int(ne//2)+1, 2)
 
     # Axial Force  |  Moment at h/2  |  Displacement at h/2 |
-    print(f"| {Axial:8.0f} |", end="")
-    print(f" {Mmid:8.1f} | {Mbench:8.0f} | %8.2f %% |" % (100*(Mbench-Mmid)/Mbench), end="")
-    print(f" {u:8.4f} | {Dbench:8.3f} | %8.2f %% |" % ((100*(Dbench-u)/Dbench)))
+    return {"Axial": Axial, "M": Mmid, "Mbench": Mbench, "D": u, "Dbench": Dbench}
 
 
 def check_case2(model, Mbench, Dbench, ndm):
@@ -22,9 +26,13 @@ def check_case2(model, Mbench, Dbench, ndm):
     Mbase  = model.eleResponse( 1, "forces")[2 if ndm==2 else 5]
     Dtip   = -model.nodeDisp(nn, 2)
 
-    print(f"| {Axial:8.0f} |", end="")
-    print(f" {Mbase:8.1f} | {Mbench:8.0f} | %8.2f %% |" % (100*(Mbench-Mbase)/Mbench), end="")
-    print(f" {Dtip:8.4f} | {Dbench:8.3f} | %8.2f %% |" % (100*(Dbench-Dtip)/Dbench))
+    return {"Axial": Axial, "M": Mbase, "Mbench": Mbench, "D": Dtip, "Dbench": Dbench}
+
+
+def print_check(row):
+    print(f"| {row.Axial:8.0f} |", end="")
+    print(f" {row.M:8.1f} | {row.Mbench:8.0f} | %8.2f %% |" % (100*(row.Mbench-row.M)/row.Mbench), end="")
+    print(f" {row.D:8.4f} | {row.Dbench:8.3f} | %8.2f %% |" % (100*(row.Dbench-row.D)/row.Dbench))
 
 
 def analyze_case1(model, Mbench, Dbench, ndm=3):
@@ -44,7 +52,7 @@ def analyze_case1(model, Mbench, Dbench, ndm=3):
     model.analysis("Static")
     model.analyze(10)
 
-    check_case1(model, Mbench[0], Dbench[0], ndm=ndm)
+    rows = [check_case1(model, Mbench[0], Dbench[0], ndm=ndm)]
 
     model.loadConst(time=0.0)
     model.pattern("Plain", 2, "Linear", load={
@@ -54,15 +62,15 @@ def analyze_case1(model, Mbench, Dbench, ndm=3):
 
     model.integrator("LoadControl", 15.0)
     model.analyze(10)
-    check_case1(model, Mbench[1], Dbench[1], ndm=ndm)
+    rows.append(check_case1(model, Mbench[1], Dbench[1], ndm=ndm))
 
     model.analyze(10)
-    check_case1(model, Mbench[2], Dbench[2], ndm=ndm)
+    rows.append(check_case1(model, Mbench[2], Dbench[2], ndm=ndm))
 
     model.analyze(10)
-    check_case1(model, Mbench[3], Dbench[3], ndm=ndm)
+    rows.append(check_case1(model, Mbench[3], Dbench[3], ndm=ndm))
 
-    return model
+    return rows
 
 def analyze_case2(model, Mbench, Dbench, ndm=3):
 
@@ -83,7 +91,7 @@ def analyze_case2(model, Mbench, Dbench, ndm=3):
 
     model.loadConst(time=0.0)
 
-    check_case2(model, Mbench[0], Dbench[0], ndm=ndm)
+    rows = [check_case2(model, Mbench[0], Dbench[0], ndm=ndm)]
 
     model.pattern("Plain", 2, "Linear", load={
             ne+1: [-1, 0, 0] + ([0, 0, 0] if ndm == 3 else [])
@@ -93,13 +101,63 @@ def analyze_case2(model, Mbench, Dbench, ndm=3):
     model.integrator("LoadControl", 10.0)
 
     model.analyze(10)
-    check_case2(model, Mbench[1], Dbench[1], ndm=ndm)
+    rows.append(check_case2(model, Mbench[1], Dbench[1], ndm=ndm))
 
     model.analyze(5)
-    check_case2(model, Mbench[2], Dbench[2], ndm=ndm)
+    rows.append(check_case2(model, Mbench[2], Dbench[2], ndm=ndm))
 
     model.analyze(5)
-    check_case2(model, Mbench[3], Dbench[3], ndm=ndm)
+    rows.append(check_case2(model, Mbench[3], Dbench[3], ndm=ndm))
+
+    return rows
+
+
+def run_case(case, element, shear, section, ndm=3):
+    # Run one benchmark case, and return a row for each load stage
+
+    if case == 1:
+        prism = Prism(
+            length = 336.0,
+            element = element,
+            section = section,
+            boundary = ("pin", "pin"),
+            geometry  = "Linear",
+            transform = "Corotational",
+            divisions = 6
+        )
+
+        if  shear :
+            Mbench = [ 235.0, 270.0, 316.0, 380.0]
+            Dbench = [ 0.202, 0.230, 0.269, 0.322]
+        else:
+            Mbench = [ 235.0, 269.0, 313.0, 375.0]
+            Dbench = [ 0.197, 0.224, 0.261, 0.311]
+
+        model = prism.create_model(ndm=ndm)
+        return analyze_case1(model, Mbench, Dbench, ndm=ndm)
+
+    else:
+        prism = Prism(
+            length  = 336.0,
+            element = element,
+            section = section,
+            boundary = ("fix", "free"),
+            geometry  = "delta",
+            transform = "Corotational",
+            divisions = 3
+        )
+
+        if  shear :
+            Mbench = [ 336.0, 470.0, 601.0, 856.0]
+            Dbench = [ 0.907,  1.34,  1.77,  2.60]
+
+        else:
+            Mbench = [ 336.0, 469.0, 598.0, 848.0]
+            Dbench = [ 0.901, 1.33 , 1.75 , 2.56 ]
+
+        model = prism.create_model(ndm=ndm)
+        return analyze_case2(model, Mbench, Dbench, ndm=ndm)
+
 
 if __name__ == "__main__":
 
@@ -119,68 +177,22 @@ if __name__ == "__main__":
             Az = d*tw
     )
 
-    #
-    # Case 1
-    #
-    for element in "ForceFrame", "ForceDeltaFrame", "PrismFrame":
-        for shear in (True, False):
-
-            if "Exact" in element and (ndm == 2 or not shear):
-                continue
-
-            prism = Prism(
-                length = 336.0,
-                element = element,
-                section = section,
-                boundary = ("pin", "pin"),
-                geometry  = "Linear",
-                transform = "Corotational",
-                divisions = 6
-            )
-
-            if  shear :
-                Mbench = [ 235.0, 270.0, 316.0, 380.0]
-                Dbench = [ 0.202, 0.230, 0.269, 0.322]
-            else:
-                Mbench = [ 235.0, 269.0, 313.0, 375.0]
-                Dbench = [ 0.197, 0.224, 0.261, 0.311]
-
-            print(f"Case 1: {element} ({shear = })")
-            model = prism.create_model(ndm=ndm)
-            analyze_case1(model, Mbench, Dbench, ndm=ndm)
+    cases = [
+        dict(case=1, element=element, shear=shear, ndm=ndm)
+        for element in ("ForceFrame", "ForceDeltaFrame", "PrismFrame")
+            for shear in (True, False)
+                if not ("Exact" in element and (ndm == 2 or not shear))
+    ] + [
+        dict(case=2, element=element, shear=shear, ndm=ndm)
+        for shear in (True, False)
+            for element in ("ForceFrame", "ExactFrame", "PrismFrame")
+                if not ("Exact" in element and (ndm == 2 or not shear))
+    ]
+
+    results = sweep(partial(run_case, section=section), cases)
+
+    for (case, element, shear), rows in results.groupby(["case", "element", "shear"], sort=False):
+        print(f"Case {case}: {element} ({shear = })")
+        for row in rows.itertuples():
+            print_check(row)
         # veux.serve(veux.render(model, model.nodeDisp, scale=100, ndf=(3 if ndm == 2 else 6)))
-
-
-    #
-    # Case 2
-    #
-
-    for shear in  (True, False):
-
-        if  shear :
-            Mbench = [ 336.0, 470.0, 601.0, 856.0]
-            Dbench = [ 0.907,  1.34,  1.77,  2.60]
-
-        else:
-            Mbench = [ 336.0, 469.0, 598.0, 848.0]
-            Dbench = [ 0.901, 1.33 , 1.75 , 2.56 ]
-
-        for element in "ForceFrame", "ExactFrame", "PrismFrame":
-            if "Exact" in element and (ndm == 2 or not shear):
-                continue
-
-            prism = Prism(
-                length  = 336.0,
-                element = element,
-                section = section,
-                boundary = ("fix", "free"),
-                geometry  = "delta",
-                transform = "Corotational",
-                divisions = 3
-            )
-
-            print(f"Case 2: {element} ({shear = })")
-            model = prism.create_model(ndm=ndm)
-            analyze_case2(model, Mbench, Dbench, ndm=ndm)
-            # veux.serve(veux.render(model, model.nodeDisp, scale=100, ndf=(3 if ndm == 2 else 6)))
-
@@ -0,0 +1,90 @@
+"""
+Rayleigh damping for the gallery's oscillator models.
+
+Damping is usually specified as a ratio of critical damping at the first
+natural frequency of a model. For a single mass on a single spring this
+frequency is simply ``sqrt(k/m)``, so ``rayleigh_damping`` uses it directly
+when the mass and stiffness are given. Otherwise the frequency is taken from
+an eigenvalue analysis, whose result may be cached under a key describing the
+model so that many identical models (for example, the oscillators of a
+spectrum) solve the eigenvalue problem only once.
+"""
+import numpy as np
+
+
+_CACHE = {}
+
+# Arguments of Model.rayleigh(alphaM, betaK, betaKinit, betaKcomm) for
+# each kind of damping, given the damping ratio and natural frequency
+_TERMS = {
+    "mass":      lambda zeta, omega: (2 * zeta * omega, 0.0, 0.0, 0.0),
+    "current":   lambda zeta, omega: (0.0, 2 * zeta / omega, 0.0, 0.0),
+    "initial":   lambda zeta, omega: (0.0, 0.0, 2 * zeta / omega, 0.0),
+    "committed": lambda zeta, omega: (0.0, 0.0, 0.0, 2 * zeta / omega),
+}
+
+
+def fundamental_frequency(model, key=None, *eigen_args):
+    """
+    Return the first natural circular frequency of ``model`` from an
+    eigenvalue analysis.
+
+    Parameters:
+        model: A model instance, or the ``openseespy`` module for the
+               global model.
+        key (hashable): If given, the frequency is cached under this key, and
+               later calls with an equal key return it without solving the
+               eigenvalue problem. The key must identify everything that
+               affects the frequency.
+        eigen_args: Options passed to ``eigen`` ahead of the number of
+               modes, such as "-fullGenLapack".
+
+    Returns:
+        float: The circular frequency, in radians per unit time.
+    """
+    if key is not None and key in _CACHE:
+        return _CACHE[key]
+
+    omega = float(np.sqrt(np.atleast_1d(model.eigen(*eigen_args, 1))[0]))
+
+    if key is not None:
+        _CACHE[key] = omega
+    return omega
+
+
+def rayleigh_damping(model, damping_ratio, mass=None, stiffness=None,
+                     term="current", key=None, eigen_args=()):
+    """
+    Assign Rayleigh damping giving ``damping_ratio`` at the first natural
+    frequency of ``model``.
+
+    Parameters:
+        model: A model instance, or the ``openseespy`` module for the
+               global model.
+        damping_ratio (float): Ratio of critical damping.
+        mass, stiffness (float): Mass and stiffness of a single-degree-of-
+               freedom model. If both are given, the frequency is computed
+               as sqrt(stiffness/mass) and no eigenvalue analysis is run.
+        term (str): Matrix the damping is proportional to; one of "mass",
+               "current" (current stiffness), "initial" (initial stiffness)
+               or "committed" (last committed stiffness).
+        key, eigen_args: Passed to ``fundamental_frequency`` when the
+               frequency is not known analytically.
+
+    Returns:
+        float: The circular frequency used.
+    """
+    if mass is not None and stiffness is not None:
+        omega = float(np.sqrt(stiffness / mass))
+    else:
+        omega = fundamental_frequency(model, key, *eigen_args)
+
+    model.rayleigh(*_TERMS[term](damping_ratio, omega))
+    return omega
+
+
+def clear_cache():
+    """
+    Forget all frequencies computed so far.
+    """
+    _CACHE.clear()
@@ -0,0 +1,194 @@
+"""
+Natural frequencies and mode shapes from the stiffness and mass matrices of
+a model.
+
+``Model.eigen`` solves the eigenvalue problem inside OpenSees, while the
+``eigen`` function of this module solves it with SciPy, which makes the
+matrices and the full eigenvectors available to the examples. The stiffness
+and mass matrices are stored as ``scipy.sparse`` arrays, the degrees of
+freedom without mass (typically rotations) are condensed out, and the lowest
+modes are found with the shift-invert Lanczos method of
+``scipy.sparse.linalg.eigsh``. Only the modes that are asked for are
+computed, instead of all of them as with a dense ``scipy.linalg.eig``.
+
+OpenSees exports the matrices of a model as dense arrays (through
+``getTangent``), so forming them still takes memory proportional to the
+square of the number of equations. The solution itself only factors the
+sparse matrix ``K - sigma*M`` once.
+"""
+import contextlib
+import numpy as np
+import scipy.linalg
+import scipy.sparse
+import scipy.sparse.linalg
+from opensees.errors import XaraError
+
+
+def has_analysis(model):
+    """
+    Return True if an analysis has been defined for ``model``.
+    """
+    # numFact fails quietly without an analysis, where getTangent prints
+    # warnings before it fails
+    try:
+        model.numFact()
+    except XaraError:
+        return False
+    return True
+
+
+@contextlib.contextmanager
+def _numbered(model):
+    # Number the equations of a model without an analysis by defining a
+    # linear transient analysis, which is wiped again on exit so that the
+    # model is left as it was found
+    if has_analysis(model):
+        yield
+        return
+
+    model.constraints("Transformation")
+    model.numberer("RCM")
+    model.system("BandGeneral")
+    model.test("NormUnbalance", 1e-8, 10)
+    model.algorithm("Linear")
+    model.integrator("Newmark", 0.5, 0.25)
+    model.analysis("Transient")
+    # The equations are numbered when the analysis is initialized
+    model.initialize()
+    try:
+        yield
+    finally:
+        model.wipeAnalysis()
+
+
+def system_matrices(model):
+    """
+    Return the stiffness and mass matrices of ``model`` as sparse arrays.
+
+    The matrices are ordered by equation number, and ``dof_map`` gives the
+    rows of each node. If no analysis has been defined, a linear transient
+    analysis numbers the equations while the matrices are formed, and is
+    removed afterwards. The numbering is the same on every call, as long as
+    the model and its analysis (or lack of one) do not change.
+    """
+    with _numbered(model):
+        K = model.getTangent(k=1)
+        M = model.getTangent(m=1)
+    return scipy.sparse.csr_array(K), scipy.sparse.csr_array(M)
+
+
+def mass_dofs(M, tol=0.0):
+    """
+    Return the equation numbers of the rows of ``M`` with any term larger
+    than ``tol`` in absolute value.
+    """
+    M = scipy.sparse.csr_array(M)
+    return np.flatnonzero(abs(M).max(axis=1).toarray().ravel() > tol)
+
+
+def eigen(model, n, sigma=0.0, tol=0.0, K=None, M=None):
+    """
+    Return the ``n`` eigenvalues of ``K*v = lam*M*v`` that are closest to
+    ``sigma``, in ascending order, and the mass-normalized eigenvectors as
+    the columns of an array.
+
+    Parameters:
+        model: Model whose matrices are used when ``K`` and ``M`` are not
+               given; see ``system_matrices``.
+        n (int): Number of modes.
+        sigma (float): Shift of the eigenvalues. The default finds the
+               lowest modes of a stable model.
+        tol (float): Rows of ``M`` with no term larger than this are
+               massless, and are condensed out of the problem.
+        K, M: Stiffness and mass matrices, dense or sparse.
+    """
+    if K is None or M is None:
+        K, M = system_matrices(model)
+
+    K = scipy.sparse.csc_array(K)
+    M = scipy.sparse.csc_array(M)
+
+    im = mass_dofs(M, tol)
+    nm = len(im)
+    if n > nm:
+        raise ValueError(f"{n} modes requested, but only {nm} degrees of freedom have mass")
+
+    # Massless rows have no coupling through M, so that solving the full
+    # shifted system with zero load at these rows applies the inverse of the
+    # condensed shifted stiffness at the rows with mass.
+    lu = scipy.sparse.linalg.splu(K - sigma*M)
+    Mmm = M[im, :][:, im]
+
+    def solve(b):
+        x = np.zeros((K.shape[0],) + b.shape[1:])
+        x[im] = b
+        return lu.solve(x)
+
+    if n < nm - 1:
+        # In shift-invert mode eigsh only uses the shape of its first argument
+        OPinv = scipy.sparse.linalg.LinearOperator((nm, nm), matvec=lambda b: solve(b)[im],
+                                                   dtype=float)
+        values, vectors = scipy.sparse.linalg.eigsh(OPinv, k=n, M=Mmm, sigma=sigma,
+                                                    which="LM", OPinv=OPinv)
+    else:
+        # Too few degrees of freedom for the Lanczos method; solve the dense
+        # problem Mmm*F*Mmm*v = mu*Mmm*v with F the inverse of the condensed
+        # shifted stiffness, and mu = 1/(lam - sigma)
+        Mmm_ = Mmm.toarray()
+        F = solve(np.eye(nm))[im]
+        mu, vectors = scipy.linalg.eigh(Mmm_ @ F @ Mmm_, Mmm_)
+        closest = np.argsort(-abs(mu))[:n]
+        values, vectors = sigma + 1/mu[closest], vectors[:, closest]
+
+    order = np.argsort(values)
+    values, vectors = values[order], vectors[:, order]
+
+    # Recover the massless degrees of freedom from the rows with mass
+    vectors = solve(Mmm @ vectors) * (values - sigma)
+
+    # Make the largest component of each mode positive
+    vectors *= np.sign(vectors[abs(vectors).argmax(axis=0), np.arange(n)])
+    return values, vectors
+
+
+def node_coordinates(model):
+    """
+    Return the node tags of ``model`` in ascending order, and an (nn, ndm)
+    array of their coordinates.
+
+    The coordinates are read from a single serialization of the model
+    instead of one ``nodeCoord`` call per node.
+    """
+    nodes = model.asdict()["StructuralAnalysisModel"]["geometry"]["nodes"]
+    tags = np.array([node["name"] for node in nodes], dtype=int)
+    coords = np.array([node["crd"] for node in nodes], dtype=float)
+    order = np.argsort(tags)
+    return tags[order], coords[order]
+
+
+def dof_map(model, nodes):
+    """
+    Return an (nn, ndf) array with the equation numbers of the DOFs of each
+    of ``nodes``, or -1 for constrained DOFs, numbered as in
+    ``system_matrices``.
+    """
+    with _numbered(model):
+        dofs = [model.nodeDOFs(tag) for tag in nodes]
+    ndf = max(map(len, dofs))
+    return np.array([d + [-1]*(ndf - len(d)) for d in dofs], dtype=int)
+
+
+def node_shapes(model, vectors, nodes=None):
+    """
+    Return the mode shapes ``vectors`` (columns indexed by equation number,
+    as returned by ``eigen``) as an (n_modes, nn, ndf) array over ``nodes``,
+    which are all nodes of the model, in ascending order, by default.
+    Constrained DOFs have zero displacement.
+    """
+    if nodes is None:
+        nodes, _ = node_coordinates(model)
+
+    dofs = dof_map(model, nodes)
+    # Pad with a row of zeros that the constrained DOFs (-1) index
+    padded = np.vstack([vectors, np.zeros((1, vectors.shape[1]))])
+    return np.moveaxis(padded[dofs], -1, 0)
@@ -0,0 +1,143 @@
+"""
+Modal participation factors and effective masses.
+
+For mass-normalized mode shapes ``phi_n`` and the influence vector ``r`` of
+a rigid translation of the supports in one direction, the participation
+factor of mode ``n`` is ``Gamma_n = phi_n'*M*r`` and its effective mass is
+``Gamma_n**2``; summed over all modes, the effective masses equal the total
+mass ``r'*M*r``. The cumulative ratio of effective to total mass tells how
+many modes a response history or spectrum analysis needs, typically enough
+to reach 90% of the mass in each horizontal direction.
+
+The tables are computed with the eigensolver of ``modes``, and cached under a
+hash of the stiffness and mass matrices of the model, so that repeated calls
+for an unchanged model do not solve the eigenvalue problem again.
+"""
+import hashlib
+import numpy as np
+import pandas as pd
+
+import modes
+
+
+_CACHE = {}
+
+_DIRECTIONS = "XYZ"
+
+
+def clear_cache():
+    _CACHE.clear()
+
+
+def _state_key(K, M):
+    digest = hashlib.sha1()
+    for A in (K, M):
+        for array in (A.data, A.indices, A.indptr):
+            digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+def influence_vectors(model, neq):
+    """
+    Return an (neq, ndm) array whose column ``d`` is the displacement of
+    every equation for a unit translation of the model in direction ``d``.
+    The first ``ndm`` DOFs of each node are taken to be its translations.
+    """
+    nodes, coords = modes.node_coordinates(model)
+    ndm = coords.shape[1]
+    dofs = modes.dof_map(model, nodes)
+
+    r = np.zeros((neq, ndm))
+    for d in range(ndm):
+        eqs = dofs[:, d]
+        r[eqs[eqs >= 0], d] = 1.0
+    return r
+
+
+def participation(M, vectors, r):
+    """
+    Return the participation factors and effective masses, as (n_modes,
+    n_directions) arrays, and the total mass in each direction, of the modes
+    in the columns of ``vectors`` for the influence vectors in the columns
+    of ``r``. The modes need not be mass-normalized.
+    """
+    MV = M @ vectors
+    modal_mass = np.einsum("ij,ij->j", vectors, MV)
+    L = MV.T @ r
+    gamma = L / modal_mass[:, None]
+    effective = L**2 / modal_mass[:, None]
+    total = np.einsum("ij,ij->j", r, M @ r)
+    return gamma, effective, total
+
+
+def modal_properties(model, n, rtol=1e-6, K=None, M=None):
+    """
+    Return a DataFrame with the frequency, period, participation factor,
+    effective mass ratio and cumulative effective mass ratio of the first
+    ``n`` modes of ``model``, indexed by mode number.
+
+    Only directions whose total mass is larger than ``rtol`` times that of
+    the heaviest direction are reported, so that, for example, a nominal
+    vertical mass does not appear as a direction of its own.
+    """
+    if K is None or M is None:
+        K, M = modes.system_matrices(model)
+
+    key = (_state_key(K, M), n, rtol)
+    if key not in _CACHE:
+        values, vectors = modes.eigen(model, n, K=K, M=M)
+        r = influence_vectors(model, K.shape[0])
+        gamma, effective, total = participation(M, vectors, r)
+
+        omega = np.sqrt(values)
+        table = pd.DataFrame({
+            "Frequency (Hz)": omega/(2*np.pi),
+            "Period (s)":     2*np.pi/omega,
+        }, index=pd.RangeIndex(1, n + 1, name="Mode"))
+
+        for d in np.flatnonzero(total > rtol*total.max()):
+            ratio = effective[:, d]/total[d]
+            table[f"Gamma {_DIRECTIONS[d]}"] = gamma[:, d]
+            table[f"Mass {_DIRECTIONS[d]}"] = ratio
+            table[f"Cumulative {_DIRECTIONS[d]}"] = np.cumsum(ratio)
+
+        _CACHE[key] = table
+
+    return _CACHE[key].copy()
+
+
+def required_modes(model, target=0.9, n=2, rtol=1e-6, directions=None, minimum=2):
+    """
+    Return the smallest number of modes whose cumulative effective mass
+    reaches ``target`` of the total in each of ``directions``, and the table
+    of ``modal_properties`` for these modes.
+
+    Parameters:
+        directions (str): Directions that must reach the target, such as
+               "XY". By default these are the horizontal translations, X in
+               two dimensions and X and Y in three, with Y or Z vertical.
+        minimum (int): Fewest modes returned, for example two to define
+               Rayleigh damping from the first two frequencies.
+
+    The number of modes computed starts at ``n`` and is doubled until the
+    target is reached. Directions without mass (see ``modal_properties``)
+    are not checked.
+    """
+    K, M = modes.system_matrices(model)
+    nm = len(modes.mass_dofs(M))
+
+    if directions is None:
+        _, coords = modes.node_coordinates(model)
+        directions = "X" if coords.shape[1] == 2 else "XY"
+
+    n = max(n, minimum)
+    while True:
+        n = min(n, nm)
+        table = modal_properties(model, n, rtol, K=K, M=M)
+        columns = [f"Cumulative {d}" for d in directions if f"Cumulative {d}" in table]
+        reached = (table[columns] >= target).all(axis=1).to_numpy()
+        if reached.any() or n == nm:
+            count = int(np.argmax(reached)) + 1 if reached.any() else n
+            count = min(max(count, minimum), n)
+            return count, table.iloc[:count]
+        n *= 2
@@ -0,0 +1,249 @@
+"""
+Ground motion records shared by the gallery examples.
+
+Files from the PEER strong motion databases are read by ``read_at2``, which
+understands both the old SMD and the NGA header layouts.
+
+Records are parsed once per file and kept in a cache keyed on the resolved
+path and modification time, so repeated requests for the same record (for
+example, once per period of a response spectrum) do not re-parse the file.
+The parsed values are also saved to a memory-mappable binary sidecar in a
+cache directory (see ``cache_dir``), so later runs do not parse the text at
+all. The cached arrays
+are marked read-only so that callers cannot corrupt them for later users;
+take a copy before modifying a record in place.
+"""
+import os
+import re
+import hashlib
+from pathlib import Path
+
+import numpy as np
+
+
+_CACHE = {}
+
+# Suffix appended to a record file name to form its binary sidecar
+SIDECAR_SUFFIX = ".cache.npy"
+
+# Environment variable that overrides the default sidecar directory
+CACHE_DIR_VARIABLE = "RECORDS_CACHE_DIR"
+
+_SIDECAR_FIELDS = ("sha256", "mtime_ns", "size", "dt", "npts", "gm")
+
+
+# Header line of the old SMD database and of NGA-West2 records, e.g.
+#   NPTS=  3930, DT= .00500 SEC
+_SMD_HEADER = re.compile(r"NPTS\s*=\s*(\d+)\s*,?\s*DT\s*=\s*([-+.0-9Ee]+)", re.IGNORECASE)
+
+# Header line of the (first) NGA database, e.g.
+#   3930 0.00500 NPTS, DT
+_NGA_HEADER = re.compile(r"^\s*(\d+)\s+([-+.0-9Ee]+)\s+NPTS\s*,\s*DT", re.IGNORECASE|re.MULTILINE)
+
+# Number of leading lines searched for the NPTS/DT header
+_HEADER_LINES = 40
+
+# Line holding the trailer that ends the values of some records, e.g.
+#   *** End Data ***
+_END = re.compile(r"^.*?end", re.IGNORECASE|re.MULTILINE)
+
+
+def read_at2(in_file):
+    """
+    Read a PEER ground motion file and extract sampling interval, number of
+    points, and ground motion data.
+
+    The header in the PEER record is, e.g., formatted as one of the following:
+
+     1) new PGA database
+        PACIFIC ENGINEERING AND ANALYSIS STRONG-MOTION DATA
+         IMPERIAL VALLEY 10/15/79 2319, EL CENTRO ARRAY 6, 230
+         ACCELERATION TIME HISTORY IN UNITS OF G
+         3930 0.00500 NPTS, DT
+
+     2) old SMD database (and NGA-West2)
+        PACIFIC ENGINEERING AND ANALYSIS STRONG-MOTION DATA
+         IMPERIAL VALLEY 10/15/79 2319, EL CENTRO ARRAY 6, 230
+         ACCELERATION TIME HISTORY IN UNITS OF G
+         NPTS=  3930, DT= .00500 SEC
+
+    Any number of lines may precede the NPTS/DT line. Values following it
+    may be laid out in any number of columns, and are read up to the end of
+    the file or to a line containing "end". A ValueError is raised if the
+    number of values read differs from NPTS.
+
+    Parameters:
+        in_file (str or Path): Path to the ground motion file.
+
+    Returns:
+        tuple: dt (float), num_pts (int), gm (np.ndarray)
+    """
+    with open(in_file, "r") as myfile:
+        text = myfile.read()
+
+    return _parse_at2(text, in_file)
+
+
+def _parse_at2(text, in_file):
+    # Locate the NPTS/DT header line; whichever format appears first wins
+    head = "\n".join(text.split("\n", _HEADER_LINES)[:_HEADER_LINES])
+    matches = [m for m in (_SMD_HEADER.search(head), _NGA_HEADER.search(head)) if m is not None]
+    if not matches:
+        raise ValueError(f"Could not find NPTS and DT in the header of {in_file}")
+
+    header = min(matches, key=lambda m: m.start())
+    num_pts = int(header.group(1))
+    dt = float(header.group(2))
+
+    # Parse everything after the header line, up to an "end" trailer
+    # such as "*** End Data ***", in one pass
+    start = text.find("\n", header.end()) + 1 or len(text)
+    match = _END.search(text, start)
+    end   = len(text) if match is None else match.start()
+
+    gm = np.fromstring(text[start:end], dtype=np.float64, sep=" ")
+    if len(gm) != num_pts:
+        raise ValueError(f"{in_file} has {len(gm)} values, but its header gives NPTS={num_pts}")
+    return dt, num_pts, gm
+
+
+def cache_dir():
+    """
+    Return the directory of the binary sidecars: the directory named by the
+    ``RECORDS_CACHE_DIR`` environment variable if it is set, and otherwise
+    ``opensees-gallery/records`` in the user cache directory
+    (``$XDG_CACHE_HOME``, or ``~/.cache``).
+    """
+    if os.environ.get(CACHE_DIR_VARIABLE):
+        return Path(os.environ[CACHE_DIR_VARIABLE])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home()/".cache"
+    return Path(base)/"opensees-gallery"/"records"
+
+
+def sidecar_path(in_file, directory=None):
+    """
+    Return the path of the binary sidecar that caches ``in_file`` in
+    ``directory`` (by default ``cache_dir()``). Its name holds a hash of the
+    resolved path of the record, so records with the same name in different
+    directories do not share a sidecar.
+    """
+    in_file = Path(in_file).resolve()
+    tag = hashlib.sha1(str(in_file).encode()).hexdigest()[:16]
+    return Path(directory or cache_dir())/f"{in_file.name}.{tag}{SIDECAR_SUFFIX}"
+
+
+def _read_sidecar(sidecar):
+    # Return the sidecar record, or None if there is no usable sidecar.
+    try:
+        rec = np.load(sidecar, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+
+    if rec.dtype.names != _SIDECAR_FIELDS:
+        return None
+    return rec
+
+
+def _write_sidecar(sidecar, digest, stat, dt, num_pts, gm):
+    dtype = np.dtype([("sha256",   "S64"),
+                      ("mtime_ns", "i8"),
+                      ("size",     "i8"),
+                      ("dt",       "f8"),
+                      ("npts",     "i8"),
+                      ("gm",       "f8", gm.shape)])
+    rec = np.zeros((), dtype=dtype)
+    rec["sha256"]   = digest
+    rec["mtime_ns"] = stat.st_mtime_ns
+    rec["size"]     = stat.st_size
+    rec["dt"]       = dt
+    rec["npts"]     = num_pts
+    rec["gm"]       = gm
+
+    # Write to a temporary file first so that a concurrent reader never
+    # sees a partially written sidecar
+    tmp = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+    try:
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            np.save(f, rec)
+        os.replace(tmp, sidecar)
+    except OSError:
+        # The cache directory may not be writable; the cache is optional
+        if tmp.exists():
+            tmp.unlink()
+
+
+def _load_record(path, stat, directory):
+    # Return (dt, num_pts, gm) for the record at ``path``, from its sidecar
+    # in ``directory`` if it is current, and otherwise by parsing the text.
+    sidecar = sidecar_path(path, directory) if directory is not None else None
+    rec = _read_sidecar(sidecar) if sidecar is not None else None
+
+    # The source is only read and hashed when its size or modification
+    # time differ from those the sidecar was written for
+    if rec is not None and (int(rec["mtime_ns"]), int(rec["size"])) == (stat.st_mtime_ns, stat.st_size):
+        return float(rec["dt"]), int(rec["npts"]), rec["gm"]
+
+    with open(path, "rb") as myfile:
+        source = myfile.read()
+    digest = hashlib.sha256(source).hexdigest()
+
+    if rec is not None and rec["sha256"].item().decode() == digest:
+        # Touched but unchanged; record the new time so as not to hash again
+        dt, num_pts, gm = float(rec["dt"]), int(rec["npts"]), np.array(rec["gm"])
+    else:
+        dt, num_pts, gm = _parse_at2(source.decode(errors="replace"), path)
+
+    if sidecar is not None:
+        _write_sidecar(sidecar, digest, stat, dt, num_pts, gm)
+    return dt, num_pts, gm
+
+
+def load_record(in_file, sidecar=True):
+    """
+    Return the record stored in ``in_file``, parsing it only if it has not
+    been read before or has changed on disk since it was last read.
+
+    The first time a record is parsed, a binary sidecar is written to the
+    cache directory (see ``sidecar_path``) holding dt, the number of points,
+    the size, modification time and SHA-256 hash of the source file, and
+    the data. Later calls, including those from other processes and runs,
+    memory-map the sidecar instead of parsing the text again. The source is
+    read and hashed only if its size or modification time changed, and
+    parsed only if its hash changed too.
+
+    Parameters:
+        in_file (str or Path): Path to the ground motion file.
+        sidecar (bool, str or Path): Whether to read and write the binary
+               sidecar, or the directory to keep it in instead of
+               ``cache_dir()``.
+
+    Returns:
+        tuple: dt (float), num_pts (int), gm (read-only np.ndarray)
+    """
+    path = Path(in_file).resolve()
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+
+    if key not in _CACHE:
+        # Drop any stale entry for an older version of the same file
+        for stale in [k for k in _CACHE if k[0] == path]:
+            del _CACHE[stale]
+
+        if sidecar is True:
+            directory = cache_dir()
+        else:
+            directory = sidecar or None
+
+        dt, num_pts, gm = _load_record(path, stat, directory)
+        gm.setflags(write=False)
+        _CACHE[key] = dt, num_pts, gm
+
+    return _CACHE[key]
+
+
+def clear_cache():
+    """
+    Forget all records read so far.
+    """
+    _CACHE.clear()
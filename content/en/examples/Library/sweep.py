@@ -0,0 +1,81 @@
+"""
+Parametric sweeps of the gallery's verification examples.
+
+A sweep runs one function, the case, for every combination of parameters
+in a list of cases, and collects the results in a single DataFrame. The
+case is called with the parameters as keyword arguments, builds and
+analyzes its own model, and returns its results as a dict (one row), a
+list of dicts (one row each, for example one per load stage), or None (a
+row with the parameters only). The rows are returned in the order of the
+cases, with the parameters in the leading columns.
+
+Cases run in a pool of processes, since every case holds its own model
+and shares nothing with the others. With ``workers=1`` they run one after
+the other in the calling process, which is easier to debug. The case must
+be a module-level function so that it can be sent to the workers, and a
+script that runs a sweep must do so under ``if __name__ == "__main__"``.
+
+For example, with a ``case(element, shear)`` defined in the script:
+
+    cases = grid(element=["PrismFrame", "ExactFrame"], shear=[False, True])
+    results = sweep(case, cases)
+"""
+import os
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+
+def grid(**axes):
+    """
+    Return the list of all combinations of the values of ``axes``, as dicts
+    of keyword arguments, with the last axis varying fastest.
+    """
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+
+def _run(task):
+    case, parameters = task
+    return case(**parameters)
+
+
+def _rows(parameters, result):
+    if result is None:
+        return [dict(parameters)]
+    if isinstance(result, dict):
+        result = [result]
+    return [{**parameters, **row} for row in result]
+
+
+def sweep(case, cases, workers=None, chunksize=1):
+    """
+    Run ``case(**parameters)`` for every dict of ``parameters`` in ``cases``
+    and return a DataFrame with a row for each result.
+
+    Parameters:
+        case: Module-level function returning a dict, a list of dicts, or None.
+        cases: Iterable of dicts of keyword arguments, such as from ``grid``.
+        workers (int): Number of processes; by default, one per CPU. With
+               one worker the cases run in the calling process.
+        chunksize (int): Number of consecutive cases sent to a worker at a
+               time. Consecutive cases that share work cached in the worker
+               (such as models with the same boundary conditions) benefit
+               from larger chunks.
+    """
+    cases = [dict(parameters) for parameters in cases]
+    tasks = [(case, parameters) for parameters in cases]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers == 1 or len(tasks) <= 1:
+        results = list(map(_run, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            results = list(pool.map(_run, tasks, chunksize=chunksize))
+
+    rows = [row for parameters, result in zip(cases, results)
+                for row in _rows(parameters, result)]
+    return pd.DataFrame(rows)
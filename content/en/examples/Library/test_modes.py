@@ -0,0 +1,64 @@
+import numpy as np
+import opensees.openseespy as ops
+
+import modes
+
+
+def frame():
+    # Two-storey portal frame with lumped translational masses; the
+    # rotations have no mass
+    model = ops.Model(ndm=2, ndf=3)
+    for i in range(3):
+        model.node(1 + 2*i, 0.0,   144.0*i)
+        model.node(2 + 2*i, 360.0, 144.0*i)
+    model.fix(1, 1, 1, 1)
+    model.fix(2, 1, 1, 1)
+    for tag in range(3, 7):
+        model.mass(tag, 0.5, 0.5, 0.0)
+
+    model.geomTransf("Linear", 1)
+    elements = [(1, 3), (2, 4), (3, 5), (4, 6), (3, 4), (5, 6)]
+    for tag, nodes in enumerate(elements, start=1):
+        model.element("ElasticBeamColumn", tag, nodes, 20.0, 29000.0, 1000.0, 1)
+    return model
+
+
+def test_eigen():
+    model = frame()
+    n = 3
+    values, vectors = modes.eigen(model, n)
+
+    # The analysis that numbered the equations is removed
+    assert not modes.has_analysis(model)
+
+    # Mass-normalized, with the largest component of each mode positive
+    K, M = modes.system_matrices(model)
+    assert np.allclose(vectors.T @ (M @ vectors), np.eye(n))
+    assert np.all(vectors[abs(vectors).argmax(axis=0), np.arange(n)] > 0)
+
+    # Same modes as OpenSees, including the massless rotations
+    nodes, _ = modes.node_coordinates(model)
+    shapes = modes.node_shapes(model, vectors, nodes)
+    assert np.allclose(values, model.eigen(n))
+    for k in range(n):
+        expected = np.array([model.nodeEigenvector(tag, k + 1) for tag in nodes])
+        expected *= np.linalg.norm(shapes[k])/np.linalg.norm(expected)
+        expected *= np.sign(np.sum(expected*shapes[k]))
+        assert np.allclose(shapes[k], expected, atol=1e-8*abs(expected).max())
+
+    # The rotations are recovered from the condensed problem
+    assert np.all(abs(shapes[:, 2:, 2]).max(axis=1) > 0)
+
+
+def test_existing_analysis():
+    # An analysis defined by the caller is used and left in place
+    model = frame()
+    model.constraints("Plain")
+    model.system("FullGeneral")
+    model.algorithm("Linear")
+    model.integrator("Newmark", 0.5, 0.25)
+    model.analysis("Transient")
+
+    values, _ = modes.eigen(model, 2)
+    assert modes.has_analysis(model)
+    assert np.allclose(values, model.eigen(2))
@@ -0,0 +1,77 @@
+import numpy as np
+import scipy.linalg
+import opensees.openseespy as ops
+
+import participation
+
+
+def shear_building(masses, k=100.0):
+    # Shear building with one horizontal DOF per floor, the storeys being
+    # zero-length springs between coincident nodes
+    model = ops.Model(ndm=2, ndf=2)
+    model.uniaxialMaterial("Elastic", 1, k)
+    model.node(0, 0.0, 0.0)
+    model.fix(0, 1, 1)
+    for i, m in enumerate(masses, start=1):
+        model.node(i, 0.0, 0.0)
+        model.fix(i, 0, 1)
+        model.mass(i, m, 0.0)
+        model.element("zeroLength", i, (i - 1, i), "-mat", 1, "-dir", 1)
+
+    n = len(masses)
+    K = np.zeros((n, n))
+    K[0, 0] = k
+    for i in range(1, n):
+        K[i-1:i+1, i-1:i+1] += k*np.array([[1, -1], [-1, 1]])
+    return model, K, np.diag(masses)
+
+
+def test_modal_properties():
+    masses = [2.0, 1.5, 1.0, 0.5]
+    model, K, M = shear_building(masses)
+    participation.clear_cache()
+    table = participation.modal_properties(model, 4)
+
+    # Only the horizontal direction has mass
+    assert [c for c in table if c.endswith(" Y")] == []
+
+    values, phi = scipy.linalg.eigh(K, M)
+    assert np.allclose(table["Period (s)"], 2*np.pi/np.sqrt(values))
+
+    # Gamma = phi'*M*1/(phi'*M*phi), whatever the sign of each mode
+    r = np.ones(len(masses))
+    gamma = phi.T @ M @ r / np.einsum("ij,ij->j", phi, M @ phi)
+    assert np.allclose(abs(table["Gamma X"]), abs(gamma))
+
+    # With every mode the effective masses add up to the total mass
+    effective = gamma**2*np.einsum("ij,ij->j", phi, M @ phi)
+    assert np.allclose(table["Mass X"], effective/sum(masses))
+    assert np.isclose(table["Cumulative X"].iloc[-1], 1.0)
+
+
+def test_required_modes():
+    model, K, M = shear_building([1.0]*8)
+    values, phi = scipy.linalg.eigh(K, M)
+    r = np.ones(8)
+    cumulative = np.cumsum((phi.T @ M @ r)**2)/np.trace(M)
+
+    # Starting from one mode, the modes are doubled until the target is
+    # reached, and the count is the first mode that reaches it
+    target = 0.98
+    participation.clear_cache()
+    count, table = participation.required_modes(model, target, n=1, minimum=1)
+    assert count == np.argmax(cumulative >= target) + 1
+    assert sorted(key[1] for key in participation._CACHE) == [1, 2, 4]
+
+    assert len(table) == count
+    assert list(table.index) == list(range(1, count + 1))
+    assert np.allclose(table["Cumulative X"], cumulative[:count])
+
+    # A single mode reaches half of the mass, but two are requested
+    count, table = participation.required_modes(model, 0.5, n=1)
+    assert cumulative[0] > 0.5
+    assert count == 2 and len(table) == 2
+
+    # A target that cannot be reached returns every mode
+    count, table = participation.required_modes(model, 1.5, n=1, minimum=1)
+    assert count == 8 and len(table) == 8
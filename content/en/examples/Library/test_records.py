@@ -0,0 +1,91 @@
+import os
+
+import numpy as np
+import pytest
+
+import records
+
+
+def write_record(path, gm, dt=0.01):
+    with open(path, "w") as f:
+        f.write("PEER NGA STRONG MOTION DATABASE RECORD\n")
+        f.write("SYNTHETIC\n")
+        f.write("ACCELERATION TIME HISTORY IN UNITS OF G\n")
+        f.write(f"NPTS= {len(gm):6d}, DT= {dt:.4f} SEC\n")
+        for i in range(0, len(gm), 5):
+            f.write("".join(f"{v:15.7E}" for v in gm[i:i+5]) + "\n")
+
+
+def fail(*args, **kwargs):
+    raise AssertionError("the source should not be read")
+
+
+def test_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.delenv(records.CACHE_DIR_VARIABLE, raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert records.cache_dir() == tmp_path/"opensees-gallery"/"records"
+
+    monkeypatch.setenv(records.CACHE_DIR_VARIABLE, str(tmp_path/"sidecars"))
+    assert records.cache_dir() == tmp_path/"sidecars"
+
+    # Records of the same name in different directories get their own sidecar
+    a = records.sidecar_path(tmp_path/"a"/"GM.AT2")
+    b = records.sidecar_path(tmp_path/"b"/"GM.AT2")
+    assert a.parent == b.parent == tmp_path/"sidecars" and a != b
+
+
+def test_sidecar(tmp_path, monkeypatch):
+    source, cache = tmp_path/"GM.AT2", tmp_path/"cache"
+    gm = np.sin(np.arange(23.0))
+    write_record(source, gm)
+
+    records.clear_cache()
+    dt, npts, loaded = records.load_record(source, sidecar=cache)
+    assert (dt, npts) == (0.01, 23) and np.allclose(loaded, gm)
+    assert not loaded.flags.writeable
+    assert records.sidecar_path(source, cache).exists()
+    assert not list(tmp_path.glob("*" + records.SIDECAR_SUFFIX))
+
+    # While its size and time are unchanged, the source is not read again
+    records.clear_cache()
+    with monkeypatch.context() as m:
+        m.setattr(records.hashlib, "sha256", fail)
+        assert np.array_equal(records.load_record(source, sidecar=cache)[2], loaded)
+
+    # A file that is touched but unchanged is hashed, but not parsed
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    with monkeypatch.context() as m:
+        m.setattr(records, "_parse_at2", fail)
+        assert np.array_equal(records.load_record(source, sidecar=cache)[2], loaded)
+
+    records.clear_cache()
+    with monkeypatch.context() as m:
+        m.setattr(records.hashlib, "sha256", fail)
+        records.load_record(source, sidecar=cache)
+
+    # A file whose contents changed is parsed again
+    write_record(source, 2*gm)
+    assert np.allclose(records.load_record(source, sidecar=cache)[2], 2*gm)
+
+
+def test_npts(tmp_path):
+    source = tmp_path/"GM.AT2"
+    write_record(source, np.ones(10))
+    with open(source, "a") as f:
+        f.write("1.0\n")
+
+    with pytest.raises(ValueError):
+        records.load_record(source, sidecar=False)
+
+
+@pytest.mark.parametrize("trailer", ["*** End Data ***", "end", "  END OF RECORD"])
+def test_trailer(tmp_path, trailer):
+    # Values stop at the line of an "end" trailer, whatever its case
+    source = tmp_path/"GM.AT2"
+    write_record(source, np.arange(12.0))
+    with open(source, "a") as f:
+        f.write(f"{trailer}\n 1.0 2.0\n")
+
+    dt, npts, gm = records.load_record(source, sidecar=False)
+    assert npts == 12 and np.array_equal(gm, np.arange(12.0))
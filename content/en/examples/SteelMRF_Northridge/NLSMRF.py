@@ -10,10 +10,14 @@
 # In[1]:
 
 
+import sys
+from pathlib import Path
 import numpy as np
 import opensees.openseespy as ops
 import matplotlib.pyplot as plt
 import eSEESminiPy
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]/"Library"))
+from records import load_record
 get_ipython().run_line_magic('matplotlib', 'notebook')
 
 
@@ -38,8 +42,8 @@ g = 9.81*(m/sec**2)   # gravitational constant
 # In[3]:
 
 
-dt = 0.01*sec
-northridge = np.loadtxt('RSN960_NORTHR_LOS270.AT2', skiprows=4).flatten()
+dt, _, northridge = load_record('RSN960_NORTHR_LOS270.AT2')
+dt = dt*sec
 northridge = np.column_stack((np.arange(0,len(northridge)*dt, dt),
                 northridge*3*g))
 
@@ -0,0 +1,60 @@
+"""
+Compare the OpenSees oscillator of ``plastic_sdof`` with the NumPy
+integrator in ``sdof.py``, for accuracy and run time.
+
+Both use Newmark's average acceleration method with the time step of the
+record, so their histories agree to round-off for undamped oscillators.
+With damping they differ after yielding, because ``plastic_sdof`` makes the
+damping proportional to the current (tangent) stiffness, while ``sdof.py``
+keeps the damping coefficient constant.
+
+Usage:
+    python benchmark.py [number of periods]
+"""
+import sys
+import time
+
+import numpy as np
+
+import sdof
+from inelastic import plastic_sdof
+
+
+def motion(dt=0.01, duration=10.0):
+    # Decaying harmonic ground acceleration
+    t = np.arange(0, duration, dt)
+    return 0.3*9.81*np.sin(2*np.pi*t)*np.exp(-0.3*t), dt
+
+
+def benchmark(num_periods=20, xi=0.0, r_post=0.0, mass=1.0):
+    rec, dt = motion()
+    periods = np.linspace(0.1, 3.0, num_periods)
+    k = 4 * np.pi**2 * mass / periods**2
+    c = 2 * xi * np.sqrt(k * mass)
+
+    # Yield at half of the elastic strength demand
+    u_elastic, _, _ = sdof.integrate(rec, dt, k, c, mass)
+    fy = 0.5 * k * np.abs(u_elastic).max(axis=-1)
+
+    start = time.perf_counter()
+    u_opensees = [
+        plastic_sdof((mass, k[i], fy[i]), rec, dt, xi=xi, r_post=r_post, analysis_dt=dt)["rel_disp"]
+        for i in range(num_periods)
+    ]
+    time_opensees = time.perf_counter() - start
+
+    start = time.perf_counter()
+    u_numpy, _, _ = sdof.integrate(rec, dt, k, c, mass, fy=fy, r_post=r_post)
+    time_numpy = time.perf_counter() - start
+
+    error = max(np.abs(u_numpy[i, 1:len(u)+1] - u).max() / np.abs(u).max()
+                for i, u in enumerate(u_opensees))
+
+    print(f"{num_periods} oscillators, {len(rec)} steps")
+    print(f"  plastic_sdof:   {time_opensees:8.3f} s")
+    print(f"  sdof.integrate: {time_numpy:8.3f} s  ({time_opensees/time_numpy:.0f}x)")
+    print(f"  max relative difference in displacement: {error:.2e}")
+
+
+if __name__ == "__main__":
+    benchmark(*map(int, sys.argv[1:2]))
@@ -1,24 +1,25 @@
-import sdof
+import sys
+from pathlib import Path
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+import pandas as pd
 
 import opensees.openseespy as op
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]/"Library"))
+from damping import rayleigh_damping
+
 FREE  = 0
 FIXED = 1
 X, Y, RZ = 1, 2, 3
 
 
-def plastic_sdof(material, motion, dt, xi=0.05, r_post=0.0):
+def _create_sdof(material, motion, dt, xi=0.05, r_post=0.0):
     """
-    Run seismic analysis of a nonlinear SDOF
-
-    :param mass: mass
-    :param k: spring stiffness
-    :param f_yield: yield strength
-    :param motion: list, acceleration values
-    :param dt: float, time step of acceleration values
-    :param xi: damping ratio
-    :param r_post: post-yield stiffness
-    :return:
+    Define the oscillator, ground motion and transient analysis of
+    ``plastic_sdof`` in the global model. If the yield strength is None, the
+    spring is linear elastic.
     """
     mass, k, f_yield = material
     op.wipe()
@@ -43,9 +44,12 @@ def plastic_sdof(material, motion, dt, xi=0.05, r_post=0.0):
 
     # Define material
     bilinear_mat_tag = 1
-    mat_type = "Steel01"
-    mat_props = [f_yield, k, r_post]
-    op.uniaxialMaterial(mat_type, bilinear_mat_tag, *mat_props)
+    if f_yield is None:
+        op.uniaxialMaterial("Elastic", bilinear_mat_tag, k)
+    else:
+        mat_type = "Steel01"
+        mat_props = [f_yield, k, r_post]
+        op.uniaxialMaterial(mat_type, bilinear_mat_tag, *mat_props)
 
     # Assign zero length element
     beam_tag = 1
@@ -63,18 +67,8 @@ def plastic_sdof(material, motion, dt, xi=0.05, r_post=0.0):
 #   op.pattern('UniformExcitation', pattern_tag_dynamic, X, accel=load_tag_dynamic)
     op.pattern('UniformExcitation', pattern_tag_dynamic, X, "-accel", load_tag_dynamic)
 
-    # set damping based on first eigen mode
-    eig = op.eigen('-fullGenLapack', 1)
-    try:
-        angular_freq = eig**0.5
-    except:
-        angular_freq = eig[0]**0.5
-    alpha_m = 0.0
-    beta_k = 2 * xi / angular_freq
-    beta_k_comm = 0.0
-    beta_k_init = 0.0
-
-    op.rayleigh(alpha_m, beta_k, beta_k_init, beta_k_comm)
+    # set damping based on the natural frequency, sqrt(k/m)
+    rayleigh_damping(op, xi, mass=mass, stiffness=k, term="current")
 
     # Run the dynamic analysis
 
@@ -90,42 +84,201 @@ def plastic_sdof(material, motion, dt, xi=0.05, r_post=0.0):
     tol = 1.0e-10
     iterations = 10
     op.test('EnergyIncr', tol, iterations, 0, 2)
-    analysis_time = (len(values) - 1) * dt
-    analysis_dt = 0.001
+
+    return bot_node, top_node
+
+
+def _num_steps(motion, dt, analysis_dt):
+    # Number of analysis steps needed to reach the end of the record
+    analysis_time = (len(motion) - 1) * dt
+    return int(np.ceil(analysis_time / analysis_dt - 1e-9))
+
+
+def plastic_sdof(material, motion, dt, xi=0.05, r_post=0.0, analysis_dt=0.001):
+    """
+    Run seismic analysis of a nonlinear SDOF
+
+    :param mass: mass
+    :param k: spring stiffness
+    :param f_yield: yield strength
+    :param motion: list, acceleration values
+    :param dt: float, time step of acceleration values
+    :param xi: damping ratio
+    :param r_post: post-yield stiffness
+    :param analysis_dt: time step of the analysis
+    :return:
+    """
+    bot_node, top_node = _create_sdof(material, motion, dt, xi, r_post)
+
+    num_steps = _num_steps(motion, dt, analysis_dt)
     outputs = {
-        "time": [],
-        "rel_disp": [],
-        "rel_accel": [],
-        "rel_vel": [],
-        "force": []
+        "time": analysis_dt * np.arange(num_steps),
+        "rel_disp": np.zeros(num_steps),
+        "rel_accel": np.zeros(num_steps),
+        "rel_vel": np.zeros(num_steps),
+        "force": np.zeros(num_steps)
     }
 
-    while op.getTime() < analysis_time:
-        curr_time = op.getTime()
+    for step in range(num_steps):
         if op.analyze(1, analysis_dt) != 0:
             print(f"Failed at time {op.getTime()}")
+            for item in outputs:
+                outputs[item] = outputs[item][:step]
             break
 
-        outputs["time"].append(curr_time)
-        outputs["rel_disp"].append(op.nodeDisp(top_node, 1))
-        outputs["rel_vel"].append(op.nodeVel(top_node, 1))
-        outputs["rel_accel"].append(op.nodeAccel(top_node, 1))
+        outputs["rel_disp"][step] = op.nodeDisp(top_node, 1)
+        outputs["rel_vel"][step] = op.nodeVel(top_node, 1)
+        outputs["rel_accel"][step] = op.nodeAccel(top_node, 1)
         op.reactions()
-        outputs["force"].append(-op.nodeReaction(bot_node, 1))  # Negative since diff node
+        outputs["force"][step] = -op.nodeReaction(bot_node, 1)  # Negative since diff node
 
     op.wipe()
-    for item in outputs:
-        outputs[item] = np.array(outputs[item])
-
     return outputs
 
 
+def peak_displacement(material, motion, dt, xi=0.05, r_post=0.0, analysis_dt=0.001):
+    """
+    Return the peak absolute relative displacement of the SDOF of
+    ``plastic_sdof``, without recording any other response. This is
+    the only quantity needed for inelastic spectra.
+    """
+    _, top_node = _create_sdof(material, motion, dt, xi, r_post)
+
+    analyze, node_disp = op.analyze, op.nodeDisp
+    peak = 0.0
+    for _ in range(_num_steps(motion, dt, analysis_dt)):
+        if analyze(1, analysis_dt) != 0:
+            print(f"Failed at time {op.getTime()}")
+            break
+        peak = max(peak, abs(node_disp(top_node, 1)))
+
+    op.wipe()
+    return peak
+
+
+# Records used by the spectrum tasks of this process; set once per worker by
+# _set_records so that records are not sent with every task
+_RECORDS = []
+
+def _set_records(records):
+    _RECORDS[:] = records
+
+
+def _spectrum_task(task, xi, r_post, mass, tol, max_iter):
+    """
+    Compute the R-mu pairs of one oscillator of ``inelastic_spectra``.
+    """
+    record, period, kind, targets = task
+    motion, dt = _RECORDS[record]
+    k = 4 * np.pi ** 2 * mass / period ** 2
+
+    # Elastic strength demand, shared by all targets of this oscillator
+    u_elastic = peak_displacement((mass, k, None), motion, dt, xi=xi, r_post=r_post)
+    f_elastic = k * u_elastic
+
+    # Without elastic demand there is no yield strength to scale, and
+    # neither R nor the ductility is defined
+    if f_elastic == 0.0:
+        return [(record, period, target if kind == "strength" else np.nan, np.nan, 1, False)
+                for target in targets]
+
+    def ductility(r):
+        f_yield = f_elastic / r
+        return peak_displacement((mass, k, f_yield), motion, dt, xi=xi, r_post=r_post) / (f_yield / k)
+
+    rows = []
+    for target in targets:
+        if kind == "strength":
+            rows.append((record, period, target, ductility(target), 1, True))
+            continue
+
+        # Constant ductility: bracket the reduction factor, starting from the
+        # elastic strength (R = 1), then bisect on log(R)
+        r_lo, r_hi = 1.0, 2.0
+        mu_hi = ductility(r_hi)
+        iterations = 1
+        while mu_hi < target and iterations < max_iter:
+            r_lo, r_hi = r_hi, 2 * r_hi
+            mu_hi = ductility(r_hi)
+            iterations += 1
+
+        r, mu = r_hi, mu_hi
+        while abs(mu - target) > tol * target and iterations < max_iter:
+            r = np.sqrt(r_lo * r_hi)
+            mu = ductility(r)
+            iterations += 1
+            if mu < target:
+                r_lo = r
+            else:
+                r_hi = r
+
+        rows.append((record, period, r, mu, iterations, abs(mu - target) <= tol * target))
+
+    return rows
+
+
+def inelastic_spectra(records, periods, ductility=None, strength=None,
+                      xi=0.05, r_post=0.0, mass=1.0, tol=0.01, max_iter=40,
+                      workers=None):
+    """
+    Compute constant-ductility or constant-strength inelastic spectra of
+    elastoplastic oscillators.
+
+    For constant strength, each oscillator is given the yield strength
+    ``f_elastic / R``, where ``f_elastic`` is the peak force of the elastic
+    oscillator, and the resulting ductility is reported. For constant
+    ductility, R is found for each target ductility by bracketing and
+    bisection; where the ductility is not monotonic in R, the root found
+    by bisection is reported. Rows whose ductility is not within ``tol`` of
+    the target after ``max_iter`` analyses are kept, with the last R tried,
+    and flagged in the Converged column. Where the elastic oscillator does
+    not move, the ductility (and for constant ductility, R) is NaN and the
+    row is not converged. Each oscillator (record and period) is an
+    independent task, so the whole set can be run in a process pool.
+
+    :param records: list of (motion, dt) pairs
+    :param periods: oscillator periods
+    :param ductility: target ductilities, for constant-ductility spectra
+    :param strength: strength reduction factors R, for constant-strength spectra
+    :param xi: damping ratio
+    :param r_post: post-yield stiffness ratio
+    :param mass: oscillator mass
+    :param tol: relative tolerance on the ductility of constant-ductility spectra
+    :param max_iter: maximum number of analyses per target ductility
+    :param workers: number of worker processes; if None, run in this process
+    :return: DataFrame with columns Record, Period(s), R, Ductility, Iterations, Converged
+    """
+
+    if (ductility is None) == (strength is None):
+        raise ValueError("Exactly one of ductility or strength must be given")
+
+    kind, targets = ("ductility", ductility) if strength is None else ("strength", strength)
+    targets = tuple(np.atleast_1d(targets).astype(float))
+
+    records = [(np.asarray(motion, dtype=float), dt) for motion, dt in records]
+    tasks = [(i, period, kind, targets) for i in range(len(records)) for period in periods]
+    run = partial(_spectrum_task, xi=xi, r_post=r_post, mass=mass, tol=tol, max_iter=max_iter)
+
+    if workers is None or workers == 1:
+        _set_records(records)
+        results = list(map(run, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_set_records,
+                                 initargs=(records,)) as pool:
+            results = list(pool.map(run, tasks))
+
+    return pd.DataFrame([row for rows in results for row in rows],
+                        columns=["Record", "Period(s)", "R", "Ductility", "Iterations", "Converged"])
+
+
 def main():
     """
     Create a plot of an elastic analysis, nonlinear analysis and closed form elastic
 
     :return:
     """
+    import sdof
     import eqsig
     import matplotlib.pyplot as plt
 
@@ -0,0 +1,114 @@
+"""
+Direct integration of single-degree-of-freedom oscillators with NumPy.
+
+This module is a small, self-contained reference for the OpenSees models in
+``inelastic.py``. It integrates
+
+    m a + c v + f_s(u) = p(t)
+
+with the Newmark method, where the spring force f_s is either linear or
+elastoplastic with linear kinematic hardening, as for the ``Steel01``
+material. Any number of oscillators are integrated at once: the properties
+``k``, ``c``, ``m`` and ``fy`` may be arrays, and the time loop operates on
+all oscillators in a single vectorized step.
+
+REFERENCES
+
+1) Chopra, A.K. "Dynamics of Structures: Theory and Applications to
+   Earthquake Engineering", Sections 5.4 and 5.7.
+2) Simo, J.C. and Hughes, T.J.R. "Computational Inelasticity", Section 1.4.
+"""
+import numpy as np
+
+
+# Newmark parameters (gamma, beta) of the two usual special cases
+NEWMARK = {
+    "average": (0.5, 0.25),
+    "linear":  (0.5, 1/6),
+}
+
+
+def integrate(p, dt, k, c, m, fy=None, r_post=0.0, method="average",
+              tol=1e-10, max_iter=20):
+    """
+    Integrate the response of SDOF oscillators to the force history ``p``.
+
+    For a ground acceleration history ``ag``, pass ``p = -m*ag``; the
+    response is then relative to the ground.
+
+    :param p: force history, shape (nt,), or (n, nt) for one history per oscillator
+    :param dt: time step of p
+    :param k: initial stiffness, scalar or shape (n,)
+    :param c: viscous damping coefficient, scalar or shape (n,)
+    :param m: mass, scalar or shape (n,)
+    :param fy: yield force, scalar or shape (n,); None for linear springs
+    :param r_post: ratio of post-yield to initial stiffness (0 <= r_post < 1)
+    :param method: "average" or "linear" acceleration, or a (gamma, beta) pair
+    :param tol: tolerance on the out-of-balance force, relative to max |p|
+    :param max_iter: maximum number of Newton iterations per step
+    :return: displacement, velocity and acceleration histories, each of shape
+             (nt,) for scalar properties and (n, nt) otherwise
+    """
+    gamma, beta = NEWMARK[method] if isinstance(method, str) else method
+
+    p = np.asarray(p, dtype=float)
+    shape = np.broadcast(*(np.asarray(x) for x in (k, c, m, np.inf if fy is None else fy))).shape
+    if p.ndim > 1:
+        shape = np.broadcast_shapes(shape, p.shape[:-1])
+
+    k, c, m, fy = (np.broadcast_to(np.asarray(x, dtype=float), shape).ravel()
+                   for x in (k, c, m, np.inf if fy is None else fy))
+    p = np.broadcast_to(p, (*shape, p.shape[-1])).reshape(len(k), -1)
+    n, nt = p.shape
+
+    # Hardening modulus giving a tangent stiffness of r_post*k after yield
+    h = r_post * k / (1.0 - r_post)
+
+    # Coefficients of the effective stiffness and load (Chopra, Table 5.7.2)
+    a1 = m / (beta * dt**2) + gamma * c / (beta * dt)
+    a2 = m / (beta * dt) + (gamma / beta - 1) * c
+    a3 = (1 / (2 * beta) - 1) * m + dt * (gamma / (2 * beta) - 1) * c
+
+    u = np.zeros((n, nt))
+    v = np.zeros((n, nt))
+    a = np.zeros((n, nt))
+    a[:, 0] = p[:, 0] / m
+
+    # Committed plastic displacement and back force of the springs
+    u_p = np.zeros(n)
+    back = np.zeros(n)
+    f_s = np.zeros(n)
+
+    scale = tol * max(np.abs(p).max(), 1.0)
+    for i in range(nt - 1):
+        p_hat = p[:, i+1] + a1 * u[:, i] + a2 * v[:, i] + a3 * a[:, i]
+
+        # Newton iterations with an elastic predictor and return mapping
+        ui = u[:, i].copy()
+        for _ in range(max_iter):
+            f_trial = k * (ui - u_p)
+            xi = f_trial - back
+            excess = np.abs(xi) - fy
+            yielding = excess > 0
+            d_gamma = np.where(yielding, excess / (k + h), 0.0)
+            sign = np.sign(xi)
+            f_s = f_trial - d_gamma * k * sign
+            k_t = np.where(yielding, k * h / (k + h), k)
+
+            residual = p_hat - f_s - a1 * ui
+            if np.abs(residual).max() <= scale:
+                break
+            ui = ui + residual / (k_t + a1)
+
+        # Commit the state of the springs
+        u_p = u_p + d_gamma * sign
+        back = back + d_gamma * h * sign
+
+        du = ui - u[:, i]
+        u[:, i+1] = ui
+        v[:, i+1] = gamma / (beta * dt) * du + (1 - gamma / beta) * v[:, i] + dt * (1 - gamma / (2 * beta)) * a[:, i]
+        a[:, i+1] = du / (beta * dt**2) - v[:, i] / (beta * dt) - (1 / (2 * beta) - 1) * a[:, i]
+
+    if shape == ():
+        return u[0], v[0], a[0]
+    return u.reshape(*shape, nt), v.reshape(*shape, nt), a.reshape(*shape, nt)
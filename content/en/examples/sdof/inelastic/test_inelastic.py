@@ -0,0 +1,53 @@
+import numpy as np
+
+from inelastic import plastic_sdof, peak_displacement, inelastic_spectra
+
+
+def motion():
+    dt = 0.01
+    t = np.arange(300)*dt
+    return 0.3*9.81*np.sin(2*np.pi*t)*np.exp(-0.5*t), dt
+
+
+def test_peak_displacement():
+    rec, dt = motion()
+    material = (1.0, 4*np.pi**2, 1.5)
+    outputs = plastic_sdof(material, rec, dt)
+    assert np.isclose(peak_displacement(material, rec, dt), np.abs(outputs["rel_disp"]).max())
+
+
+def test_spectra():
+    rec, dt = motion()
+    strength = inelastic_spectra([(rec, dt)], [0.5, 1.0], strength=[1.0, 2.0])
+    assert np.allclose(strength[strength["R"] == 1.0]["Ductility"], 1.0)
+
+    ductility = inelastic_spectra([(rec, dt)], [0.5, 1.0], ductility=[2.0], tol=0.01)
+    assert np.allclose(ductility["Ductility"], 2.0, rtol=0.01)
+    assert np.all(ductility["R"] > 1.0)
+    assert ductility["Converged"].all()
+
+    # Targets not reached within max_iter are flagged
+    ductility = inelastic_spectra([(rec, dt)], [0.5], ductility=[8.0], tol=1e-4, max_iter=3)
+    assert not ductility["Converged"].any()
+
+    # Without elastic demand the ductility is undefined
+    strength = inelastic_spectra([(0*rec, dt)], [0.5], strength=[2.0])
+    assert strength["Ductility"].isna().all() and not strength["Converged"].any()
+
+
+def test_numpy_integrator():
+    import sdof
+
+    rec, dt = motion()
+    k, fy = 4*np.pi**2, 1.5
+    outputs = plastic_sdof((1.0, k, fy), rec, dt, xi=0.0, r_post=0.1, analysis_dt=dt)
+    u, v, a = sdof.integrate(rec, dt, k, 0.0, 1.0, fy=fy, r_post=0.1)
+    n = len(outputs["rel_disp"])
+    assert np.allclose(u[1:n+1], outputs["rel_disp"])
+
+    # Oscillators integrated together match those integrated one by one
+    k = 4*np.pi**2/np.array([0.5, 1.0, 2.0])**2
+    u, _, _ = sdof.integrate(rec, dt, k, 0.1*np.sqrt(k), 1.0, fy=0.02*k, method="linear")
+    for i in range(len(k)):
+        ui, _, _ = sdof.integrate(rec, dt, k[i], 0.1*np.sqrt(k[i]), 1.0, fy=0.02*k[i], method="linear")
+        assert np.allclose(u[i], ui)
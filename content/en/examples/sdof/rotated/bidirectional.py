@@ -74,8 +74,10 @@ Ground Motion records provided as arguments.
 ===============================================================================
 """
 
+import os
 import sys
 from pathlib import Path
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 
 import opensees.openseespy as op
 import pandas as pd
@@ -87,40 +89,24 @@ try:
 except Exception:
     pass
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]/"Library"))
+from records import load_record
+from damping import rayleigh_damping
+from linear import linear_response
 
-def read_gm_file(in_file):
-    """
-    Read a ground motion file and extract sampling interval, number of points, 
-    and ground motion data.
-    
-    Parameters:
-        in_file (str or Path): Path to the ground motion file.
-    
-    Returns:
-        tuple: dt (float), num_pts (int), gm (np.ndarray)
-    """
-    with open(in_file, "r") as myfile:
-        data = myfile.read().splitlines()
-    # Extract number of points and dt from the 4th header line
-    sp = data[3].split(' ')
-    num_pts = int(sp[2].split(',')[0])
-    dt = float(sp[4])
-    header_lines = 4
+GRAVITY = 386.1
 
-    # Remove header lines and convert data to float array
-    data = data[header_lines:]
-    data = list(filter(str.strip, data))
-    gm = np.array(list(map(float, data)))
-    return dt, num_pts, gm
 
-
-def beam_sdof(period):
+def beam_sdof(period, damping_ratio=0.05):
     """
-    Set up and analyze a single degree-of-freedom (SDOF) beam model 
-    for a given period using OpenSeesPy.
+    Set up a single degree-of-freedom (SDOF) beam model for a given period.
     
     Parameters:
         period (float): The target period for the SDOF system.
+        damping_ratio (float): Viscous damping ratio of the SDOF system.
+
+    Returns:
+        Model: A new model instance with the oscillator and its damping.
     """
     # SDOF parameters
     length_val = 1.0
@@ -134,32 +120,227 @@ def beam_sdof(period):
     moment_inertia_y = np.pi * (radius**4) / 4
     stiffness = 3 * elastic_modulus * moment_inertia_z / (length_val**3)
     mass_val = stiffness * (period**2) / (4 * np.pi**2)
-    omega = np.sqrt(stiffness / mass_val)
-
-    # Model setup
-    op.model('basic', ndm=3, ndf=6)
-    op.node(1, 0.0, 0.0, 0.0)
-    op.node(2, 0.0, 0.0, length_val)
-    op.geomTransf('Linear', 1, 0.0, 1.0, 0.0)
-    op.fix(1, 1, 1, 1, 1, 1, 1)
-    op.uniaxialMaterial("Elastic", 11, elastic_modulus)
-    op.element("ElasticBeamColumn", 12, 1, 2, area, elastic_modulus,
-               shear_modulus, polar_moment, moment_inertia_y, moment_inertia_z, 1)
-    op.mass(2, mass_val, mass_val, 0.0, 0.0, 0.0, 0.0)
-
-    # Eigenvalue analysis to verify period
-    eigen_values = op.eigen(1)
-    omega = np.sqrt(eigen_values[0])
-    calculated_period = 2 * np.pi / omega
-    # Printing handled by caller based on verbosity if needed
-
-    # Rayleigh damping
-    damping_ratio = 0.05
-    alpha_m = 0.0
-    beta_k_curr = 0.0
-    beta_k_comm = 2.0 * damping_ratio / omega
-    beta_k_init = 0.0
-    op.rayleigh(alpha_m, beta_k_curr, beta_k_init, beta_k_comm)
+
+    # Model setup; each oscillator gets its own model instance so that
+    # several can be analyzed at once in separate processes
+    model = op.Model(ndm=3, ndf=6)
+    model.node(1, 0.0, 0.0, 0.0)
+    model.node(2, 0.0, 0.0, length_val)
+    model.geomTransf('Linear', 1, 0.0, 1.0, 0.0)
+    model.fix(1, 1, 1, 1, 1, 1, 1)
+    model.uniaxialMaterial("Elastic", 11, elastic_modulus)
+    model.element("ElasticBeamColumn", 12, 1, 2, area, elastic_modulus,
+                  shear_modulus, polar_moment, moment_inertia_y, moment_inertia_z, 1)
+    model.mass(2, mass_val, mass_val, 0.0, 0.0, 0.0, 0.0)
+
+    # Rayleigh damping; the tip of a cantilever with a massless rotation has
+    # the stiffness 3EI/L^3 used above, so no eigenvalue analysis is needed
+    rayleigh_damping(model, damping_ratio, mass=mass_val, stiffness=stiffness,
+                     term="committed")
+    return model
+
+
+def sdof_damping(model, period, damping_ratio):
+    """
+    Replace the damping of a ``beam_sdof`` model by ``damping_ratio``.
+
+    Only the ratio of stiffness to mass, the square of the circular
+    frequency, enters the damping coefficient, so it is given as such.
+    """
+    rayleigh_damping(model, damping_ratio, mass=1.0, stiffness=(2 * np.pi / period)**2,
+                     term="committed")
+
+
+def sdof_model(period, dt, gm_x, gm_y, damping_ratio=0.05, integrator=("Newmark", 0.5, 0.25)):
+    """
+    Set up the SDOF beam model of ``beam_sdof`` with a bidirectional ground
+    motion and a transient analysis, ready for ``sdof_history``.
+
+    Parameters are those of ``sdof_response``.
+
+    Returns:
+        Model: The model, with its loading and analysis.
+    """
+    model = beam_sdof(period, damping_ratio)
+
+    for tag, (direction, gm) in enumerate(((1, gm_x), (2, gm_y)), start=3):
+        model.timeSeries('Path', tag, dt=dt, values=gm, factor=GRAVITY)
+        model.pattern('UniformExcitation', tag, direction, accel=tag)
+
+    model.constraints('Penalty', 1e18, 1e18)
+    model.system("SparseGeneral")
+    model.algorithm("Linear")
+    model.integrator(*integrator)
+    model.analysis("Transient")
+    return model
+
+
+def sdof_history(model, dt, num_pts, dt_analysis=None):
+    """
+    Run the transient analysis of a model from ``sdof_model``, starting from
+    rest at time zero, and return the displacement history of its tip.
+
+    The model is reverted to its initial state first, so that one model
+    can be analyzed again, for example after its damping is changed by
+    ``sdof_damping``, without rebuilding it and its loading.
+
+    Returns:
+        np.ndarray: Displacement history of shape (nt, 2).
+    """
+    model.reset()
+    model.setTime(0.0)
+
+    if dt_analysis is None:
+        dt_analysis = dt
+    t_max_analysis = dt * num_pts
+    t_final = int(round(t_max_analysis / dt_analysis))
+
+    # Preallocate the response history; row 0 holds the initial state
+    disp_xy = np.zeros((t_final + 1, 2))
+
+    # Bind the per-step calls once to keep the loop body minimal
+    analyze = model.analyze
+    node_disp = model.nodeDisp
+
+    for step in range(1, t_final + 1):
+        if analyze(1, dt_analysis) != 0:
+            raise Exception("Failed to converge")
+        disp_xy[step] = node_disp(2)[:2]
+
+    return disp_xy
+
+
+def sdof_response(period, dt, num_pts, gm_x, gm_y, dt_analysis=None, damping_ratio=0.05,
+                  integrator=("Newmark", 0.5, 0.25)):
+    """
+    Compute the displacement history of the SDOF beam model under a
+    bidirectional ground motion.
+
+    With the default average acceleration integrator, the response differs
+    from the closed-form ``linear_response`` only by the period elongation
+    of the trapezoidal rule, a relative error of about (omega*dt_analysis)**2/12
+    in the period. This is 1e-3 at a period of about 60*dt_analysis and
+    falls with its square, so short periods need a smaller ``dt_analysis``.
+
+    Parameters:
+        period (float): The target period for the SDOF system.
+        dt (float): Time step of the ground motion records.
+        num_pts (int): Number of points in the ground motion records.
+        gm_x, gm_y (np.ndarray): Ground accelerations (g) in each direction.
+        dt_analysis (float): Analysis time step; defaults to dt, which
+                             should be a whole multiple of it. The records
+                             are interpolated linearly between points.
+        damping_ratio (float): Viscous damping ratio of the SDOF system.
+        integrator (tuple): Arguments of ``model.integrator``.
+
+    Returns:
+        np.ndarray: Displacement history of shape (nt, 2).
+    """
+    model = sdof_model(period, dt, gm_x, gm_y, damping_ratio, integrator)
+    return sdof_history(model, dt, num_pts, dt_analysis)
+
+
+def spectral_ordinates(task):
+    """
+    Compute the RotD50 and RotD100 pseudo-accelerations of one record at
+    one period, for each of several damping ratios.
+
+    The model and its loading are built once, and analyzed again from rest
+    for each damping ratio.
+
+    Parameters:
+        task (tuple): (period, gm_file1, gm_file2, damping), where the files
+                      are the two horizontal components of the record and
+                      damping is a sequence of damping ratios.
+
+    Returns:
+        np.ndarray: RotD50 and RotD100 Sa (g), shape (n_damping, 2).
+    """
+    period, gm_file1, gm_file2, damping = task
+
+    # Records are cached per process, so repeated periods do not re-read them
+    dt1, num_pts1, gm_data1 = load_record(gm_file1)
+    dt2, num_pts2, gm_data2 = load_record(gm_file2)
+    # Assuming dt1==dt2 and num_pts1==num_pts2 for both directions
+    omega = 2 * np.pi / period
+    model = sdof_model(period, dt1, gm_data1, gm_data2, damping[0])
+
+    ordinates = np.empty((len(damping), 2))
+    for i, zeta in enumerate(damping):
+        sdof_damping(model, period, zeta)
+        ordinates[i] = rotd(sdof_history(model, dt1, num_pts1), ROTD_BASIS, (50, 100)) * (omega**2) / GRAVITY
+    return ordinates
+
+
+def linear_ordinates(gm_files, periods, damping=(0.05,)):
+    """
+    Compute the RotD50 and RotD100 pseudo-accelerations of one record at
+    every period and damping ratio using the closed-form linear oscillator
+    in ``linear.py`` instead of an OpenSees model.
+
+    Parameters:
+        gm_files (tuple): Paths of the two horizontal components of the record.
+        periods (np.ndarray): Periods of the spectrum.
+        damping (sequence): Damping ratios of the spectrum.
+
+    Returns:
+        np.ndarray: RotD50 and RotD100 Sa (g), shape (n_periods, n_damping, 2).
+    """
+    gm_file1, gm_file2 = gm_files
+    dt, num_pts, gm_data1 = load_record(gm_file1)
+    _, _, gm_data2 = load_record(gm_file2)
+
+    # One oscillator per (period, damping) pair, all integrated at once
+    period_grid, damping_grid = (a.ravel() for a in np.meshgrid(periods, damping, indexing="ij"))
+    disp_x = linear_response(gm_data1 * GRAVITY, dt, period_grid, damping_grid)
+    disp_y = linear_response(gm_data2 * GRAVITY, dt, period_grid, damping_grid)
+
+    omega = 2 * np.pi / period_grid
+    return np.array([
+        rotd(np.column_stack((ux, uy)), ROTD_BASIS, (50, 100)) * (w**2) / GRAVITY
+        for ux, uy, w in zip(disp_x, disp_y, omega)
+    ]).reshape(len(periods), len(damping), 2)
+
+
+def rotation_basis(n_angles=180):
+    """
+    Build the projection basis used to rotate a horizontal response pair.
+
+    Parameters:
+        n_angles (int): Number of equally spaced angles in [0, 180) degrees.
+
+    Returns:
+        np.ndarray: Array of shape (2, n_angles) whose columns are
+                    (cos(theta), sin(theta)).
+    """
+    theta = np.deg2rad(np.arange(n_angles) * 180.0 / n_angles)
+    return np.vstack((np.cos(theta), np.sin(theta)))
+
+
+# Projection basis for the RotD angles, shared by all analyses
+ROTD_BASIS = rotation_basis()
+
+
+def rotd(disp_xy, basis, percentiles=(50, 100)):
+    """
+    Compute RotDnn ordinates of a bidirectional response history.
+
+    The history is projected onto every angle of ``basis`` with a single
+    matrix product, the peak absolute response is taken for each angle,
+    and the requested percentiles are taken over the angles.
+
+    Parameters:
+        disp_xy (np.ndarray): Response history of shape (nt, 2).
+        basis (np.ndarray): Projection basis of shape (2, n_angles), as
+                            returned by ``rotation_basis``.
+        percentiles (sequence): Percentiles to compute, e.g. (0, 50, 100)
+                                for RotD00, RotD50 and RotD100.
+
+    Returns:
+        np.ndarray: One ordinate per requested percentile.
+    """
+    peaks = np.abs(disp_xy @ basis).max(axis=0)
+    return np.percentile(peaks, percentiles)
 
 
 def plot_spectra(plot_title, spectra_type, gm_index, spectra_df, verbose, save=False):
@@ -174,7 +355,9 @@ def plot_spectra(plot_title, spectra_type, gm_index, spectra_df, verbose, save=F
         verbose (bool): If True, prints status messages.
     """
     fig, ax = plt.subplots(figsize=(18, 12))
-    ax.plot(spectra_df['Period(s)'], spectra_df[spectra_type], '.-', label=f'GM{gm_index}')
+    for damping, curve in spectra_df.groupby('Damping'):
+        ax.plot(curve['Period(s)'], curve[spectra_type], '.-',
+                label=f'GM{gm_index} ({100*damping:g}% damping)')
     ax.set_xlabel('Period (sec)', fontsize=30)
     ax.set_ylabel(spectra_type, fontsize=30)
     ax.set_title(plot_title, fontsize=40)
@@ -191,6 +374,127 @@ def plot_spectra(plot_title, spectra_type, gm_index, spectra_df, verbose, save=F
             print(f"Saved plot for {plot_title} of GM{gm_index}", file=sys.stderr)
 
 
+def adaptive_periods(evaluate, periods, tol, max_depth=6):
+    """
+    Refine a period grid where a spectrum is poorly represented by linear
+    interpolation between its ordinates.
+
+    Starting from the coarse grid ``periods``, the midpoint of every
+    interval is evaluated. Intervals whose midpoint ordinate differs from
+    the linear interpolation of its end points by more than ``tol`` (a
+    fraction of the peak ordinate) are split in two and tested again, so
+    analyses concentrate around peaks and other regions of high curvature.
+    All midpoints of one pass are evaluated in a single call.
+
+    Parameters:
+        evaluate (callable): Maps an array of periods, shape (n,), to
+                             spectral ordinates of shape (n, ...).
+        periods (np.ndarray): Initial, coarse period grid.
+        tol (float): Relative tolerance on the interpolated ordinates.
+        max_depth (int): Maximum number of times an interval of the initial
+                         grid is halved.
+
+    Returns:
+        tuple: Sorted periods and their ordinates.
+    """
+    periods = np.sort(np.asarray(periods, dtype=float))
+    values = np.asarray(evaluate(periods))
+
+    all_periods, all_values = [periods], [values]
+    left,  right  = periods[:-1], periods[1:]
+    v_left, v_right = values[:-1], values[1:]
+
+    for _ in range(max_depth):
+        if len(left) == 0:
+            break
+
+        middle = (left + right) / 2
+        v_middle = np.asarray(evaluate(middle))
+        all_periods.append(middle)
+        all_values.append(v_middle)
+
+        scale = max(np.abs(v).max() for v in all_values)
+        error = np.abs(v_middle - (v_left + v_right) / 2).reshape(len(middle), -1).max(axis=1)
+        split = error > tol * scale
+
+        left,   right   = np.concatenate((left[split], middle[split])), np.concatenate((middle[split], right[split]))
+        v_left, v_right = np.concatenate((v_left[split], v_middle[split])), np.concatenate((v_middle[split], v_right[split]))
+
+    periods, values = np.concatenate(all_periods), np.concatenate(all_values)
+    order = np.argsort(periods)
+    return periods[order], values[order]
+
+
+def write_spectra(gm_spectra, spectra_file):
+    """
+    Write a spectrum to a space-separated text file.
+
+    The file is written under a temporary name and then renamed, so that an
+    interrupted run never leaves a partial file that would be taken as
+    complete when resuming.
+
+    Parameters:
+        gm_spectra (DataFrame): Spectrum of one ground motion.
+        spectra_file (str or Path): Destination file.
+
+    Returns:
+        Path: The path of the written file.
+    """
+    spectra_file = Path(spectra_file)
+    spectra_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = spectra_file.with_name(spectra_file.name + ".tmp")
+    gm_spectra.to_csv(tmp, sep=' ', header=True, index=False)
+    os.replace(tmp, spectra_file)
+    return spectra_file
+
+
+def read_spectra(spectra_file):
+    """
+    Read a spectrum written by ``write_spectra``.
+    """
+    return pd.read_csv(spectra_file, sep=' ')
+
+
+def matches_spectra(spectra_file, periods, damping, method, tol=None):
+    """
+    Return True if ``spectra_file`` holds a spectrum computed with
+    ``method`` for every damping ratio in ``damping`` and every period in
+    ``periods`` or, with an adaptive grid (``tol`` given), at least every
+    period of the initial grid.
+    """
+    try:
+        stored = read_spectra(spectra_file)
+    except (OSError, ValueError):
+        return False
+
+    if stored.empty or not {'Period(s)', 'Damping', 'Method'} <= set(stored.columns):
+        return False
+    if (stored['Method'] != method).any():
+        return False
+
+    stored_damping = np.unique(stored['Damping'].astype(float))
+    stored_periods = np.unique(stored['Period(s)'].astype(float))
+    damping = np.unique(damping)
+    if len(stored_damping) != len(damping) or not np.allclose(stored_damping, damping):
+        return False
+    if len(stored) != len(stored_periods) * len(damping):
+        return False
+
+    if tol is None:
+        return len(stored_periods) == len(periods) and np.allclose(stored_periods, np.sort(periods))
+    return np.isclose(np.asarray(periods)[:, None], stored_periods[None, :]).any(axis=1).all()
+
+
+def _run_now(function, *args):
+    """
+    Call ``function`` in the current process, with the interface of
+    ``Executor.submit``.
+    """
+    future = Future()
+    future.set_result(function(*args))
+    return future
+
+
 def spectra(
     gm_file_list,
     int_t_reg_1=0.1,
@@ -199,7 +503,13 @@ def spectra(
     end_t_reg_2=2,
     int_t_reg_3=0.5,
     end_t_reg_3=5,
-    verbose=True
+    verbose=True,
+    workers=None,
+    method="opensees",
+    damping=0.05,
+    tol=None,
+    output=None,
+    resume=True
 ):
     """
     Generate RotD50 and RotD100 spectra for provided ground motion files.
@@ -214,18 +524,48 @@ def spectra(
         int_t_reg_3 (float): Period interval for the third region.
         end_t_reg_3 (float): End period for the third region.
         verbose (bool): If True, print status messages to stderr.
+        workers (int): Number of processes used to analyze periods
+                       concurrently. The periods of all records share
+                       the processes, so a record does not wait for the
+                       previous one to finish. If None, everything runs
+                       in the current process.
+        method (str): "opensees" to analyze the beam model of ``beam_sdof``,
+                      or "exact" to use the closed-form linear oscillator,
+                      which is much faster for elastic spectra. The beam
+                      model is analyzed at the record step, and differs
+                      from the closed form by the period error of
+                      ``sdof_response``.
+        damping (float or sequence): Damping ratio(s) of the spectra. All
+                      ratios share the record loading and period grid.
+        tol (float): If given, the regions above define a coarse initial
+                     grid that is refined for each record by
+                     ``adaptive_periods`` until linear interpolation of the
+                     spectra is within ``tol`` times the peak Sa.
+        output (str or Path): If given, the spectrum of the i-th ground
+                     motion is written to ``output/GMi_Spectra.txt`` as soon
+                     as it is complete, instead of being kept in memory.
+        resume (bool): If True, ground motions whose spectrum file already
+                     exists in ``output`` are skipped, provided that the
+                     file holds the periods, damping ratios and method of
+                     this call (see ``matches_spectra``). Other files are
+                     recomputed and overwritten.
     
     Returns:
-        list: A list of DataFrames containing spectra for each ground motion.
+        list: One entry per ground motion, whose type depends on ``output``:
+
+              - if ``output`` is None, a DataFrame with the columns
+                'Period(s)', 'Damping', 'RotD50Sa(g)', 'RotD100Sa(g)' and
+                'Method', and one row for each (period, damping) pair;
+              - otherwise, the Path of the file holding that DataFrame,
+                which ``read_spectra`` reads back, so that the spectra of
+                many records need not be held in memory at once.
     """
-    op.wipe()
-    gravity = 386.1
-
     num_gms = len(gm_file_list)
     if verbose:
         print(f'\nGenerating Spectra for {num_gms} provided GMs\n', file=sys.stderr)
 
-    gm_response = []
+    if method not in ("opensees", "exact"):
+        raise ValueError(f"Unknown method '{method}'")
 
     # Define period ranges for the spectra once, used for all ground motions
     periods = np.concatenate([
@@ -234,92 +574,89 @@ def spectra(
         np.arange(end_t_reg_2 + int_t_reg_3, end_t_reg_3 + int_t_reg_3, int_t_reg_3)
     ])
 
-    for eq_index, (gm_file1, gm_file2) in enumerate(gm_file_list, start=1):
+    damping = np.atleast_1d(damping)
+
+    def record_spectra(eq_index, gm_files, submit, workers):
+        # Spectrum of one record; its analyses are submitted to the shared
+        # executor, so those of other records run while these are pending
         if verbose:
             print(f'Generating Spectra for GM: {eq_index} ...', file=sys.stderr)
 
-        gm_spectra = pd.DataFrame(columns=['Period(s)', 'RotD50Sa(g)', 'RotD100Sa(g)'])
-
-        for idx, period in enumerate(periods, start=1):
-            gm_spectra.loc[idx - 1, 'Period(s)'] = period
-
-            # Read ground motion files for both directions
-            dt1, num_pts1, gm_data1 = read_gm_file(gm_file1)
-            dt2, num_pts2, gm_data2 = read_gm_file(gm_file2)
-            # Assuming dt1==dt2 and num_pts1==num_pts2 for both directions
-            dt, num_pts = dt1, num_pts1
-
-            gm_x = gm_data1
-            gm_y = gm_data2
-            gm_xy_mat = np.column_stack((gm_x, gm_x, gm_y, gm_y))
-
-            gm_direction = [1, 1, 2, 2]
-            gm_fact = [np.cos(0.0), np.sin(0.0), np.sin(0.0), np.cos(0.0)]
-            id_tag = 2
-
-            beam_sdof(period)
-
-            for i in range(1, 5):
-                op.timeSeries('Path', id_tag + i, dt=dt,
-                              values=list(gm_xy_mat[:, i - 1]),
-                              factor=gm_fact[i - 1] * gravity)
-                op.pattern('UniformExcitation', id_tag + i, gm_direction[i - 1],
-                           accel=id_tag + i)
-
-            op.wipeAnalysis()
-            op.constraints('Penalty', 1e18, 1e18)
-            op.system("SparseGeneral")
-            op.algorithm("Linear")
-            op.integrator("TRBDF2")
-            op.analysis("Transient")
-
-            dt_analysis = dt * 10
-            t_max_analysis = dt * num_pts
-            t_final = int(t_max_analysis / dt_analysis)
-            t_current = op.getTime()
-
-            u1 = [0.0]
-            u2 = [0.0]
-            ok = 0
-
-            while ok == 0 and t_current < t_final:
-                ok = op.analyze(1, dt_analysis)
-                if ok != 0:
-                    raise Exception("Failed to converge")
-                t_current = op.getTime()
-                u1.append(op.nodeDisp(2, 1))
-                u2.append(op.nodeDisp(2, 2))
-
-            disp_xy = np.column_stack((u1, u2))
-
-            rot_disp = np.zeros((180, 1))
-            for theta in range(0, 180):
-                angle_rad = np.deg2rad(theta)
-                rot_matrix = np.array([
-                    [np.cos(angle_rad), np.sin(-angle_rad)],
-                    [np.sin(angle_rad), np.cos(angle_rad)]
-                ])
-                rotated = disp_xy @ rot_matrix
-                rot_disp[theta, 0] = np.max(rotated[:, 0])
-
-            omega = 2 * np.pi / period
-            rot_acc = rot_disp * (omega**2) / gravity
-            gm_spectra.loc[idx - 1, 'RotD50Sa(g)'] = np.median(rot_acc)
-            gm_spectra.loc[idx - 1, 'RotD100Sa(g)'] = np.max(rot_acc)
-
-            op.wipe()
-
-        gm_response.append(gm_spectra)
+        def evaluate(periods):
+            # Ordinates of this record, shape (len(periods), n_damping, 2)
+            if method == "exact":
+                # Split the periods between workers; each chunk is
+                # integrated in a single pass over the record
+                chunks = np.array_split(periods, min(workers, len(periods)))
+                futures = [submit(linear_ordinates, gm_files, chunk, damping) for chunk in chunks]
+                return np.concatenate([future.result() for future in futures])
+            else:
+                # Every period is an independent analysis
+                futures = [submit(spectral_ordinates, (period, *gm_files, damping)) for period in periods]
+                return np.array([future.result() for future in futures])
+
+        if tol is None:
+            gm_periods, gm_values = periods, evaluate(periods)
+        else:
+            gm_periods, gm_values = adaptive_periods(evaluate, periods, tol)
+
+        # One row per (period, damping) pair
+        gm_spectra = pd.DataFrame({
+            'Period(s)':    np.repeat(gm_periods, len(damping)),
+            'Damping':      np.tile(damping, len(gm_periods)),
+            'RotD50Sa(g)':  gm_values[:, :, 0].ravel(),
+            'RotD100Sa(g)': gm_values[:, :, 1].ravel(),
+            'Method':       method
+        })
+
+        if output is not None:
+            gm_spectra = write_spectra(gm_spectra, Path(output) / f"GM{eq_index}_Spectra.txt")
+
         if verbose:
-            print(f'Generated Spectra for GM: {eq_index}\n', file=sys.stderr)
+            print(f'Generated Spectra for GM: {eq_index} ({len(gm_periods)} periods)\n', file=sys.stderr)
+        return gm_spectra
+
+    gm_response = [None] * num_gms
+    pending = []
+    for eq_index, gm_files in enumerate(gm_file_list, start=1):
+        if output is not None:
+            spectra_file = Path(output) / f"GM{eq_index}_Spectra.txt"
+            if resume and matches_spectra(spectra_file, periods, damping, method, tol):
+                if verbose:
+                    print(f'Found Spectra for GM: {eq_index} in {spectra_file}', file=sys.stderr)
+                gm_response[eq_index - 1] = spectra_file
+                continue
+        pending.append((eq_index, gm_files))
+
+    if workers is None or workers == 1 or not pending:
+        for eq_index, gm_files in pending:
+            gm_response[eq_index - 1] = record_spectra(eq_index, gm_files, _run_now, 1)
+    else:
+        # The analyses of every record go to one process pool. Each record
+        # waits for its own results in a thread, and is written as soon as
+        # they are in, while the pool carries on with the other records.
+        with ProcessPoolExecutor(max_workers=workers) as pool, \
+             ThreadPoolExecutor(max_workers=len(pending)) as records:
+            futures = {
+                eq_index: records.submit(record_spectra, eq_index, gm_files, pool.submit, workers)
+                for eq_index, gm_files in pending
+            }
+            for eq_index, future in futures.items():
+                gm_response[eq_index - 1] = future.result()
 
     return gm_response
 
 
 if __name__ == "__main__":
-    # Expecting sys.argv to contain file paths for ground motions in pairs
-    # Example: python script.py GM11.AT2 GM21.AT2 GM12.AT2 GM22.AT2 ...
+    # Expecting sys.argv to contain file paths for ground motions in pairs,
+    # optionally preceded by the number of worker processes
+    # Example: python script.py [-j 8] GM11.AT2 GM21.AT2 GM12.AT2 GM22.AT2 ...
     args = sys.argv[1:]
+    workers = None
+    if args[:1] == ["-j"]:
+        workers = int(args[1])
+        args = args[2:]
+
     if len(args) % 2 != 0 or not args:
         print("Please provide an even number of ground motion files as arguments.", file=sys.stderr)
         sys.exit(1)
@@ -327,13 +664,15 @@ if __name__ == "__main__":
     # Group files into pairs
     gm_file_list = [(args[i], args[i+1]) for i in range(0, len(args), 2)]
 
-    # Generate spectra for provided ground motions
-    gm_responses = spectra(gm_file_list)
+    # Generate spectra for provided ground motions; each spectrum is written
+    # to Spectra/GMi_Spectra.txt as soon as it is done, and spectra found
+    # there from an earlier, interrupted run are not recomputed
+    spectra_files = spectra(gm_file_list, workers=workers, output="Spectra")
 
     # Optionally plot the spectra
     verbose = True
-    for idx, gm_spectra in enumerate(gm_responses, start=1):
+    for idx, spectra_file in enumerate(spectra_files, start=1):
+        gm_spectra = read_spectra(spectra_file)
         plot_spectra('RotD50 Spectra', 'RotD50Sa(g)', idx, gm_spectra, verbose)
         plot_spectra('RotD100 Spectra', 'RotD100Sa(g)', idx, gm_spectra, verbose)
         plt.show()
-
@@ -73,23 +73,14 @@ try:
 except:
     pass
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]/"Library"))
+from records import load_record
 
-def ReadGMFile(inFile):
-    with open (inFile, "r") as myfile:
-        data = myfile.read().splitlines()
-        sp = data[3].split(' ')
-        NumPts = int(sp[2].split(',')[0])
-        dt = float(sp[4])
-        hdlines = 4
-
-        for k in range(0,hdlines):
-            del data [0]
 
-        data = list(filter(str.strip, data))
-        gm = np.array(list(map(float, data)))
+def ReadGMFile(inFile):
+    # Records are cached, so each file is only parsed once per run
+    return load_record(inFile)
 
-        return dt,NumPts,gm
-#       return dt,100,gm[:100]
 
 def beam_sdof(T):
     # Setting SDOF Variables
@@ -188,38 +179,37 @@ def spectra(
                                   list(np.arange(End_T_Reg_1+Int_T_Reg_2,End_T_Reg_2+Int_T_Reg_2,Int_T_Reg_2)),
                                   list(np.arange(End_T_Reg_2+Int_T_Reg_3,End_T_Reg_3+Int_T_Reg_3,Int_T_Reg_3))),axis=0)
         ii = 0
+        GMinter = 0
+
+        ## Reading GM Files (once per ground motion, shared by all periods)
+        iGMinput = 'GM1'+str(iEQ)+' GM2'+str(iEQ) ;
+        GMinput  = iGMinput.split(' ');
+        gmXY     = {}
+        for i in range(2):
+            inFile   = GMdir/(GMinput[i]+'.AT2');
+            dt, NumPts , gmXY[i+1] = ReadGMFile(inFile)
+
+        # Storing GM Histories
+        gmX = gmXY[1]
+        gmY = gmXY[2]
+        gmXY_mat = np.column_stack((gmX,gmX,gmY,gmY))
+
+        # Bidirectional Uniform Earthquake ground motion (uniform acceleration input at all support nodes)
+        iGMfile      = 'GM1'+str(iEQ)+' GM2'+str(iEQ)
+        GMfile       = iGMfile.split(' ')
+        GMdirection  = [1,1,2,2];
+        GMfact	     = [np.cos( GMinter*np.pi/180),
+                        np.sin(-GMinter*np.pi/180),
+                        np.sin( GMinter*np.pi/180),
+                        np.cos( GMinter*np.pi/180)]
+        IDTag        = 2
 
         for T in Periods:
             ii = ii+1
-            GMinter = 0
 
             # Storing Periods
             GM_SPECTRA.loc[ii-1,'Period(s)'] = T
 
-
-            ## Reading GM Files
-            iGMinput = 'GM1'+str(iEQ)+' GM2'+str(iEQ) ;
-            GMinput  = iGMinput.split(' ');
-            gmXY     = {}
-            for i in range(2):
-                inFile   = GMdir/(GMinput[i]+'.AT2');
-                dt, NumPts , gmXY[i+1] = ReadGMFile(inFile)
-
-            # Storing GM Histories
-            gmX = gmXY[1]
-            gmY = gmXY[2]
-            gmXY_mat = np.column_stack((gmX,gmX,gmY,gmY))
-
-            # Bidirectional Uniform Earthquake ground motion (uniform acceleration input at all support nodes)
-            iGMfile      = 'GM1'+str(iEQ)+' GM2'+str(iEQ)
-            GMfile       = iGMfile.split(' ')
-            GMdirection  = [1,1,2,2];
-            GMfact	     = [np.cos( GMinter*np.pi/180),
-                            np.sin(-GMinter*np.pi/180),
-                            np.sin( GMinter*np.pi/180),
-                            np.cos( GMinter*np.pi/180)]
-            IDTag        = 2
-
             beam_sdof(T)
 
             for i in (1, 2, 3, 4):
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+
+from linear import linear_response
+from bidirectional import (sdof_response, spectral_ordinates, spectra, adaptive_periods, rotd,
+                           read_spectra, write_spectra, matches_spectra, ROTD_BASIS, GRAVITY)
+
+
+def write_record(path, gm, dt):
+    with open(path, "w") as f:
+        f.write("PEER NGA STRONG MOTION DATABASE RECORD\n")
+        f.write("SYNTHETIC\n")
+        f.write("ACCELERATION TIME HISTORY IN UNITS OF G\n")
+        f.write(f"NPTS= {len(gm):6d}, DT= {dt:.4f} SEC\n")
+        for i in range(0, len(gm), 5):
+            f.write("".join(f"{v:15.7E}" for v in gm[i:i+5]) + "\n")
+
+
+def motion(nt, dt, seed):
+    # Band-limited random acceleration (g) with a smooth envelope
+    rng = np.random.default_rng(seed)
+    t = np.arange(nt)*dt
+    gm = np.convolve(rng.standard_normal(nt), np.ones(5)/5, mode="same")
+    return 0.2*gm*np.sin(np.pi*t/t[-1])
+
+
+def test_opensees_ordinates():
+    dt, nt = 0.01, 300
+    gm_x, gm_y = motion(nt, dt, 1), motion(nt, dt, 2)
+    periods = np.array([0.5, 1.0, 2.0])
+
+    exact_x = linear_response(gm_x*GRAVITY, dt, periods)
+    exact_y = linear_response(gm_y*GRAVITY, dt, periods)
+
+    for k, period in enumerate(periods):
+        exact = rotd(np.column_stack((exact_x[k], exact_y[k])), ROTD_BASIS)
+        # The period elongation of average acceleration is about
+        # (omega*dt)**2/12, so the shortest period is analyzed at dt/2 and
+        # compared at the points of the record
+        substeps = 2 if period < 60*dt else 1
+        disp_xy = sdof_response(period, dt, nt, gm_x, gm_y, dt_analysis=dt/substeps)
+        assert np.allclose(rotd(disp_xy[::substeps], ROTD_BASIS), exact, rtol=1e-3)
+
+
+def test_opensees_damping(tmp_path):
+    # One model analyzed again for each damping ratio gives the ordinates
+    # of a model built for each ratio
+    dt, nt = 0.01, 300
+    files = tmp_path/"GM11.AT2", tmp_path/"GM21.AT2"
+    for i, file in enumerate(files):
+        write_record(file, motion(nt, dt, 20 + i), dt)
+
+    damping = [0.02, 0.05, 0.10]
+    together = spectral_ordinates((1.0, *files, damping))
+    for zeta, ordinates in zip(damping, together):
+        assert np.allclose(ordinates, spectral_ordinates((1.0, *files, [zeta]))[0])
+    assert np.all(np.diff(together[:, 0]) < 0)
+
+
+def test_exact_spectra(tmp_path):
+    # A step of ground acceleration along X: each oscillator starts from
+    # rest under a constant force, and first peaks at t = pi/omega_d with a
+    # displacement of (1 + exp(-pi*zeta/sqrt(1 - zeta**2))) times the
+    # static one, so Sa = (1 + exp(...))*a_g along the step
+    dt, nt, a_g = 0.005, 1000, 0.3
+    files = tmp_path/"GM11.AT2", tmp_path/"GM21.AT2"
+    write_record(files[0], np.full(nt, a_g), dt)
+    write_record(files[1], np.zeros(nt), dt)
+
+    damping = [0.02, 0.05, 0.10]
+    grid = spectra([files], 0.5, 1, 0.5, 2, 1.0, 3, verbose=False, method="exact",
+                   damping=damping)[0]
+    assert len(grid) == 5*len(damping)
+
+    for zeta, curve in grid.groupby("Damping"):
+        assert np.allclose(curve["Period(s)"].astype(float), [0.5, 1.0, 1.5, 2.0, 3.0])
+
+        sa = (1 + np.exp(-np.pi*zeta/np.sqrt(1 - zeta**2)))*a_g
+        # The response lies along X, so its projection on an angle theta
+        # peaks at sa*|cos(theta)|
+        assert np.allclose(curve["RotD100Sa(g)"].astype(float), sa, rtol=1e-3)
+        assert np.allclose(curve["RotD50Sa(g)"].astype(float),
+                           sa*np.percentile(abs(ROTD_BASIS[0]), 50), rtol=1e-3)
+
+
+def test_adaptive_periods():
+    # A narrow peak between points of the coarse grid is resolved
+    def evaluate(periods):
+        return np.exp(-((periods - 1.1)/0.05)**2)[:, None]
+
+    periods, values = adaptive_periods(evaluate, np.arange(0.5, 3.5, 0.5), tol=0.01, max_depth=8)
+    assert np.all(np.diff(periods) > 0)
+    assert np.allclose(values[:, 0], evaluate(periods)[:, 0])
+
+    fine = np.linspace(0.5, 3.0, 2001)
+    assert np.abs(np.interp(fine, periods, values[:, 0]) - evaluate(fine)[:, 0]).max() < 0.05
+    assert len(periods) < 100
+
+
+def test_spectra_output(tmp_path):
+    dt, nt = 0.02, 400
+    files = tmp_path/"GM11.AT2", tmp_path/"GM21.AT2"
+    for i, file in enumerate(files):
+        write_record(file, motion(nt, dt, 10 + i), dt)
+
+    in_memory = spectra([files], 0.5, 1, 0.5, 2, 1.0, 3, verbose=False, method="exact")[0]
+
+    output = tmp_path/"Spectra"
+    paths = spectra([files], 0.5, 1, 0.5, 2, 1.0, 3, verbose=False, method="exact", output=output)
+    assert paths == [output/"GM1_Spectra.txt"]
+    stored = read_spectra(paths[0])
+    pd.testing.assert_frame_equal(stored, in_memory)
+
+    # Spectra with the same periods, damping and method are not recomputed
+    # when resuming
+    stored["RotD50Sa(g)"] = 0.0
+    write_spectra(stored, paths[0])
+    spectra([files], 0.5, 1, 0.5, 2, 1.0, 3, verbose=False, method="exact", output=output)
+    assert np.all(read_spectra(paths[0])["RotD50Sa(g)"] == 0.0)
+
+    periods = [0.5, 1.0, 1.5, 2.0, 3.0]
+    assert matches_spectra(paths[0], periods, [0.05], "exact")
+    assert not matches_spectra(paths[0], periods, [0.02], "exact")
+    assert not matches_spectra(paths[0], periods, [0.05], "opensees")
+    assert not matches_spectra(paths[0], periods[1:], [0.05], "exact")
+    # An adaptive grid need only contain the initial one
+    assert matches_spectra(paths[0], periods[1:], [0.05], "exact", tol=0.01)
+
+    # A spectrum for other damping ratios is recomputed
+    spectra([files], 0.5, 1, 0.5, 2, 1.0, 3, verbose=False, method="exact", output=output,
+            damping=0.02)
+    assert np.all(read_spectra(paths[0])["Damping"] == 0.02)
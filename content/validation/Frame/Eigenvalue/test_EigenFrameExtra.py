@@ -3,538 +3,211 @@
 # This Extends EigenFrame.py verification test to:
 #   1) run different element options to test:
 #           ForceBeamColumn, DspBeamColumn, ElasticSection and FiberSection2d.
+#   2) run different eigenvalue solvers
+#
+# The geometry, fixities and (lumped) masses of the frame are computed once
+# by FrameTemplate, and each variant only adds its own section and elements.
+# The element masses of the original test are lumped (-lMass), so they are
+# assigned to the nodes directly.
 
-from math import asin
+from math import sqrt
+import pytest
 import opensees.openseespy as ops
 
+#    units kip, ft
+
+# properties
+A = 3.0  # area = 3ft^2
+E = 432000.0  # youngs mod = 432000 k/ft^2
+I = 1.0  # second moment of area I=1ft^4
+M = 3.0  # mas/length = 4 kip sec^2/ft^2
+coordTransf = "Linear"  # Linear, PDelta, Corotational
+
+nPts = 3  # numGauss Points
+
+# a rectangular section with A=3 and I = 1 (b=1.5, d=2) 2d bending about y-y axis
+y = 2.0
+z = 1.5
 
-Elements = [
-    "elasticBeam",
-    "forceBeamElasticSection",
-    "dispBeamElasticSection",
-    "forceBeamFiberSectionElasticMaterial",
-    "dispBeamFiberSectionElasticMaterial",
+# print table of camparsion
+#                         Bathe & Wilson               Peterson                    SAP2000                  SeismoStruct
+comparisonResults = [
+    [0.589541, 5.52695, 16.5878],
+    [0.589541, 5.52696, 16.5879],
+    [0.589541, 5.52696, 16.5879],
+    [0.58955, 5.527, 16.588],
 ]
+tolerances = [9.99e-7, 9.99e-6, 9.99e-5]
+
+
+class FrameTemplate:
+    """
+    Nodes, fixities, masses and element connectivity of a regular plane
+    frame, computed once and added to any number of models.
+    """
+    def __init__(self, numBay=10, numFloor=9, bayWidth=20.0, storyHeight=10.0, mass=M):
+        numCol = numBay + 1
+        self.nodes = {
+            j*numCol + i + 1: (i*bayWidth, j*storyHeight)
+            for j in range(numFloor + 1) for i in range(numCol)
+        }
+        self.fixed = range(1, numCol + 1)
+
+        # columns, then beams
+        self.elements = [
+            (j*numCol + i + 1, (j + 1)*numCol + i + 1)
+            for i in range(numCol) for j in range(numFloor)
+        ] + [
+            (j*numCol + i + 1, j*numCol + i + 2)
+            for j in range(1, numFloor + 1) for i in range(numBay)
+        ]
 
-def test_EigenFrameExtra():
+        # lump half of the mass of every element at each of its ends
+        self.masses = dict.fromkeys(self.nodes, 0.0)
+        for end1, end2 in self.elements:
+            (x1, y1), (x2, y2) = self.nodes[end1], self.nodes[end2]
+            half = 0.5 * mass * sqrt((x2 - x1)**2 + (y2 - y1)**2)
+            self.masses[end1] += half
+            self.masses[end2] += half
 
+    def model(self):
+        model = ops.Model(ndm=2, ndf=3)
+        for tag, (x, y) in self.nodes.items():
+            model.node(tag, x, y)
+            if self.masses[tag] != 0.0:
+                model.mass(tag, self.masses[tag], self.masses[tag], 0.0)
 
-    for element in Elements:
+        for tag in self.fixed:
+            model.fix(tag, 1, 1, 1)
 
-        ops.wipe()
+        model.geomTransf(coordTransf, 1)
+        return model
 
-        ops.model("Basic", "-ndm", 2)
 
-        #    units kip, ft
+FRAME = FrameTemplate()
 
-        # properties
-        bayWidth = 20.0
-        storyHeight = 10.0
 
-        numBay = 10
-        numFloor = 9
+#
+# sections
+#
+def elasticSection(model):
+    model.section("Elastic", 1, E, A, I)
 
-        A = 3.0  # area = 3ft^2
-        E = 432000.0  # youngs mod = 432000 k/ft^2
-        I = 1.0  # second moment of area I=1ft^4
-        M = 3.0  # mas/length = 4 kip sec^2/ft^2
-        coordTransf = "Linear"  # Linear, PDelta, Corotational
-        massType = "-lMass"  # -lMass, -cMass
 
-        nPts = 3  # numGauss Points
+def fiberSection(model):
+    # 2000 fibers through the depth are needed for the discretization error
+    # in I (a factor 1 - 1/numFiberY^2) to be within the eigenvalue tolerance
+    numFiberY = 2000
+    numFiberZ = 1
+    model.uniaxialMaterial("Elastic", 1, E)
+    model.section("Fiber", 1)
+    #   patch rect 1 numFiberY numFiberZ 0.0 0.0 z y
+    model.patch("quad", 1, numFiberY, numFiberZ,
+                -y/2.0, -z/2.0, y/2.0, -z/2.0, y/2.0, z/2.0, -y/2.0, z/2.0)
 
-        # an elastic material
-        ops.uniaxialMaterial("Elastic", 1, E)
 
-        # an elastic section
-        ops.section("Elastic", 1, E, A, I)
+def rectangleSection(model):
+    # For an elastic material the section integrals of 1 and y^2 are exact
+    # with two fibers at the Gauss points of the depth, +/- y/(2*sqrt(3))
+    model.uniaxialMaterial("Elastic", 1, E)
+    model.section("Fiber", 1)
+    for yi in (-y/(2.0*sqrt(3.0)), y/(2.0*sqrt(3.0))):
+        model.fiber(yi, 0.0, A/2.0, 1)
 
-        # a fiber section with A=3 and I = 1 (b=1.5, d=2) 2d bending about y-y axis
-        #   b 1.5 d 2.0
-        y = 2.0
-        z = 1.5
-        numFiberY = 2000  # note we only need so many to get the required accuracy on eigenvalue 1e-7!
-        numFiberZ = 1
-        ops.section("Fiber", 2)
-        #   patch rect 1 numFiberY numFiberZ 0.0 0.0 z y
-        ops.patch(
-            "quad",
-            1,
-            numFiberY,
-            numFiberZ,
-            -y / 2.0,
-            -z / 2.0,
-            y / 2.0,
-            -z / 2.0,
-            y / 2.0,
-            z / 2.0,
-            -y / 2.0,
-            z / 2.0,
-        )
 
-        # add the nodes
-        #  - floor at a time
-        nodeTag = 1
-        yLoc = 0.0
-        for j in range(0, numFloor + 1):
-            xLoc = 0.0
-            for i in range(numBay + 1):
-                ops.node(nodeTag, xLoc, yLoc)
-                xLoc += bayWidth
-                nodeTag += 1
-
-            yLoc += storyHeight
-
-        # fix base nodes
-        for i in range(1, numBay + 2):
-            ops.fix(i, 1, 1, 1)
-
-        # add column element
-        transfTag = 1
-        ops.geomTransf(coordTransf, transfTag)
-        integTag1 = 1
-        ops.beamIntegration("Lobatto", integTag1, 1, nPts)
-        integTag2 = 2
-        ops.beamIntegration("Lobatto", integTag2, 2, nPts)
-        eleTag = 1
-        for i in range(numBay + 1):
-            end1 = i + 1
-            end2 = end1 + numBay + 1
-            for j in range(numFloor):
-
-                if element == "elasticBeam":
-                    ops.element(
-                        "elasticBeamColumn",
-                        eleTag,
-                        end1, end2
-                        A,
-                        E,
-                        I,
-                        1,
-                        "-mass",
-                        M,
-                        massType,
-                    )
-                elif element == "forceBeamElasticSection":
-                    ops.element(
-                        "forceBeamColumn",
-                        eleTag,
-                        end1, end2
-                        transfTag,
-                        integTag1,
-                        "-mass",
-                        M,
-                    )
-                elif element == "dispBeamElasticSection":
-                    ops.element(
-                        "dispBeamColumn",
-                        eleTag,
-                        end1, end2
-                        transfTag,
-                        integTag1,
-                        "-mass",
-                        M,
-                        massType,
-                    )
-                elif element == "forceBeamFiberSectionElasticMaterial":
-                    ops.element(
-                        "forceBeamColumn",
-                        eleTag,
-                        end1, end2
-                        transfTag,
-                        integTag2,
-                        "-mass",
-                        M,
-                    )
-                elif element == "dispBeamFiberSectionElasticMaterial":
-                    ops.element(
-                        "dispBeamColumn",
-                        eleTag,
-                        end1, end2
-                        transfTag,
-                        integTag2,
-                        "-mass",
-                        M,
-                        massType,
-                    )
-                else:
-                    print("BARF")
-
-                end1 = end2
-                end2 = end1 + numBay + 1
-                eleTag += 1
-
-        # add beam elements
-        for j in range(1, numFloor + 1):
-            end1 = (numBay + 1) * j + 1
-            end2 = end1 + 1
-            for i in range(numBay):
-                if element == "elasticBeam":
-                    ops.element(
-                        "elasticBeamColumn",
-                        eleTag,
-                        end1, end2
-                        A,
-                        E,
-                        I,
-                        1,
-                        "-mass",
-                        M,
-                        massType,
-                    )
-                elif element == "forceBeamElasticSection":
-                    ops.element(
-                        "forceBeamColumn",
-                        eleTag,
-                        end1, end2
-                        transfTag,
-                        integTag1,
-                        "-mass",
-                        M,
-                    )
-                elif element == "dispBeamElasticSection":
-                    ops.element(
-                        "dispBeamColumn",
-                        eleTag,
-                        end1, end2
-                        transfTag,
-                        integTag1,
-                        "-mass",
-                        M,
-                        massType,
-                    )
-                elif element == "forceBeamFiberSectionElasticMaterial":
-                    ops.element(
-                        "forceBeamColumn",
-                        eleTag,
-                        end1, end2
-                        transfTag,
-                        integTag2,
-                        "-mass",
-                        M,
-                    )
-                elif element == "dispBeamFiberSectionElasticMaterial":
-                    ops.element(
-                        "dispBeamColumn",
-                        eleTag,
-                        end1, end2
-                        transfTag,
-                        integTag2,
-                        "-mass",
-                        M,
-                        massType,
-                    )
-                else:
-                    print("BARF")
-
-                #           element(elasticBeamColumn eleTag end1 end2 A E I 1 -mass M
-                end1 = end2
-                end2 = end1 + 1
-                eleTag += 1
-
-        # calculate eigenvalues
-        numEigen = 3
-        eigenValues = ops.eigen(numEigen)
-        PI = 2 * asin(1.0)
-
-        # determine PASS/FAILURE of test
-        testOK = 0
-
-        # print table of camparsion
-        #                         Bathe & Wilson               Peterson                    SAP2000                  SeismoStruct
-
-        comparisonResults = [
-            [0.589541, 5.52695, 16.5878],
-            [0.589541, 5.52696, 16.5879],
-            [0.589541, 5.52696, 16.5879],
-            [0.58955, 5.527, 16.588],
-        ]
-        print("\n\nEigenvalue Comparisons for element:", element)
-        tolerances = [9.99e-7, 9.99e-6, 9.99e-5]
-        formatString = "{:>15}{:>15}{:>15}{:>15}{:>15}"
-        print(
-            formatString.format(
-                "OpenSees", "Bathe&Wilson", "Peterson", "SAP2000", "SeismoStruct"
-            )
-        )
-        formatString = "{:>15.5f}{:>15.4f}{:>15.4f}{:>15.4f}{:>15.3f}"
-        for i in range(numEigen):
-            lamb = eigenValues[i]
-            print(
-                formatString.format(
-                    lamb,
-                    comparisonResults[0][i],
-                    comparisonResults[1][i],
-                    comparisonResults[2][i],
-                    comparisonResults[3][i],
-                )
-            )
-            resultOther = comparisonResults[2][i]
-            tol = tolerances[i]
-            if abs(lamb - resultOther) > tol:
-                testOK = -1
-                print("failed->", abs(lamb - resultOther), tol)
-
-        assert testOK == 0
-
-    solverTypes = [
-        "-genBandArpack",
-        "-fullGenLapack",
-        "-UmfPack",
-        "-SuperLU",
-        "-ProfileSPD",
-    ]
-
-    for solverType in solverTypes:
-
-        element = "elasticBeam"
-
-        ops.wipe()
-
-        ops.model("Basic", "-ndm", 2)
-
-        #    units kip, ft
-
-        # properties
-        bayWidth = 20.0
-        storyHeight = 10.0
-
-        numBay = 10
-        numFloor = 9
-
-        A = 3.0  # area = 3ft^2
-        E = 432000.0  # youngs mod = 432000 k/ft^2
-        I = 1.0  # second moment of area I=1ft^4
-        M = 3.0  # mas/length = 4 kip sec^2/ft^2
-        coordTransf = "Linear"  # Linear, PDelta, Corotational
-        massType = "-lMass"  # -lMass, -cMass
-
-        nPts = 3  # numGauss Points
-
-        # an elastic material
-        ops.uniaxialMaterial("Elastic", 1, E)
-
-        # an elastic section
-        ops.section("Elastic", 1, E, A, I)
-
-        # a fiber section with A=3 and I = 1 (b=1.5, d=2) 2d bending about y-y axis
-        #   b 1.5 d 2.0
-        y = 2.0
-        z = 1.5
-        numFiberY = 2000  # note we only need so many to get the required accuracy on eigenvalue 1e-7!
-        numFiberZ = 1
-        ops.section("Fiber", 2)
-        #   patch rect 1 numFiberY numFiberZ 0.0 0.0 z y
-        ops.patch(
-            "quad",
-            1,
-            numFiberY,
-            numFiberZ,
-            -y / 2.0,
-            -z / 2.0,
-            y / 2.0,
-            -z / 2.0,
-            y / 2.0,
-            z / 2.0,
-            -y / 2.0,
-            z / 2.0,
-        )
+#
+# element variants: (section, element type, element arguments after the nodes)
+#
+Elements = {
+    "elasticBeam":                          (None, "elasticBeamColumn", (A, E, I, 1)),
+    "forceBeamElasticSection":              (elasticSection, "forceBeamColumn", (1, 1)),
+    "dispBeamElasticSection":               (elasticSection, "dispBeamColumn",  (1, 1)),
+    "forceBeamFiberSectionElasticMaterial": (rectangleSection, "forceBeamColumn", (1, 1)),
+    "dispBeamFiberSectionElasticMaterial":  (rectangleSection, "dispBeamColumn",  (1, 1)),
+}
 
-        # add the nodes
-        #  - floor at a time
-        nodeTag = 1
-        yLoc = 0.0
-        for j in range(0, numFloor + 1):
-            xLoc = 0.0
-            for i in range(numBay + 1):
-                ops.node(nodeTag, xLoc, yLoc)
-                xLoc += bayWidth
-                nodeTag += 1
-
-            yLoc += storyHeight
-
-        # fix base nodes
-        for i in range(1, numBay + 2):
-            ops.fix(i, 1, 1, 1)
-
-        # add column element
-        transfTag = 1
-        ops.geomTransf(coordTransf, transfTag)
-        integTag1 = 1
-        ops.beamIntegration("Lobatto", integTag1, 1, nPts)
-        integTag2 = 2
-        ops.beamIntegration("Lobatto", integTag2, 2, nPts)
-        eleTag = 1
-        for i in range(numBay + 1):
-            end1 = i + 1
-            end2 = end1 + numBay + 1
-            for j in range(numFloor):
-
-                if element == "elasticBeam":
-                    ops.element(
-                        "elasticBeamColumn",
-                        eleTag,
-                        end1, end2
-                        A,
-                        E,
-                        I,
-                        1,
-                        "-mass",
-                        M,
-                        massType,
-                    )
-
-                elif element == "forceBeamElasticSection":
-                    ops.element(
-                        "forceBeamColumn",
-                        eleTag,
-                        end1, end2
-                        transfTag,
-                        integTag1,
-                        "-mass",
-                        M,
-                    )
-
-                elif element == "dispBeamElasticSection":
-                    ops.element(
-                        "dispBeamColumn",
-                        eleTag,
-                        end1, end2
-                        transfTag,
-                        integTag1,
-                        "-mass",
-                        M,
-                        massType,
-                    )
-                elif element == "forceBeamFiberSectionElasticMaterial":
-                    ops.element(
-                        "forceBeamColumn",
-                        eleTag,
-                        end1, end2
-                        transfTag,
-                        integTag2,
-                        "-mass",
-                        M,
-                    )
-
-                elif element == "dispBeamFiberSectionElasticMaterial":
-                    ops.element(
-                        "dispBeamColumn",
-                        eleTag,
-                        end1, end2
-                        transfTag,
-                        integTag2,
-                        "-mass",
-                        M,
-                        massType,
-                    )
-                else:
-                    print("BARF")
-
-                end1 = end2
-                end2 = end1 + numBay + 1
-                eleTag += 1
-
-        # add beam elements
-        for j in range(1, numFloor + 1):
-            end1 = (numBay + 1) * j + 1
-            end2 = end1 + 1
-            for i in range(numBay):
-                if element == "elasticBeam":
-                    ops.element(
-                        "elasticBeamColumn",
-                        eleTag,
-                        end1, end2
-                        A, E, I,
-                        1,
-                        "-mass", M,
-                        massType,
-                    )
-                elif element == "forceBeamElasticSection":
-                    ops.element(
-                        "forceBeamColumn",
-                        eleTag,
-                        end1, end2
-                        transfTag,
-                        integTag1,
-                        "-mass", M,
-                    )
-                elif element == "dispBeamElasticSection":
-                    ops.element(
-                        "dispBeamColumn",
-                        eleTag,
-                        end1, end2
-                        transfTag,
-                        integTag1,
-                        "-mass", M,
-                        massType,
-                    )
-                elif element == "dispBeamFiberSectionElasticMaterial":
-                    ops.element(
-                        "dispBeamColumn",
-                        eleTag,
-                        end1, end2
-                        transfTag,
-                        integTag2,
-                        "-mass", M,
-                        massType,
-                    )
-                elif element == "forceBeamFiberSectionElasticMaterial":
-                    ops.element(
-                        "forceBeamColumn",
-                        eleTag,
-                        end1, end2
-                        transfTag,
-                        integTag2,
-                        "-mass", M,
-                    )
-
-                #           element(elasticBeamColumn eleTag end1 end2 A E I 1 -mass M
-                end1 = end2
-                end2 = end1 + 1
-                eleTag += 1
-
-        # calculate eigenvalues
-        numEigen = 3
-        eigenValues = ops.eigen(solverType, numEigen)
-        PI = 2 * asin(1.0)
-
-        # determine PASS/FAILURE of test
-        testOK = 0
-
-        # print table of camparsion
-        #                         Bathe & Wilson               Peterson                    SAP2000                  SeismoStruct
-
-        comparisonResults = [
-            [0.589541, 5.52695, 16.5878],
-            [0.589541, 5.52696, 16.5879],
-            [0.589541, 5.52696, 16.5879],
-            [0.58955, 5.527, 16.588],
-        ]
-        print("\n\nEigenvalue Comparisons for solverType:", solverType)
-        tolerances = [9.99e-7, 9.99e-6, 9.99e-5]
-        formatString = "{:>15}{:>15}{:>15}{:>15}{:>15}"
+
+def buildModel(element):
+    section, eleType, eleArgs = Elements[element]
+
+    model = FRAME.model()
+    if section is not None:
+        section(model)
+        model.beamIntegration("Lobatto", 1, 1, nPts)
+
+    for eleTag, (end1, end2) in enumerate(FRAME.elements, 1):
+        model.element(eleType, eleTag, end1, end2, *eleArgs)
+
+    return model
+
+
+def checkEigenvalues(eigenValues, label):
+    # determine PASS/FAILURE of test
+    testOK = 0
+
+    print("\n\nEigenvalue Comparisons for", label)
+    formatString = "{:>15}{:>15}{:>15}{:>15}{:>15}"
+    print(
+        formatString.format(
+            "OpenSees", "Bathe&Wilson", "Peterson", "SAP2000", "SeismoStruct"
+        )
+    )
+    formatString = "{:>15.5f}{:>15.4f}{:>15.4f}{:>15.4f}{:>15.3f}"
+    for i, lamb in enumerate(eigenValues):
         print(
             formatString.format(
-                "OpenSees", "Bathe&Wilson", "Peterson", "SAP2000", "SeismoStruct"
+                lamb,
+                comparisonResults[0][i],
+                comparisonResults[1][i],
+                comparisonResults[2][i],
+                comparisonResults[3][i],
             )
         )
-        formatString = "{:>15.5f}{:>15.4f}{:>15.4f}{:>15.4f}{:>15.3f}"
-        for i in range(numEigen):
-            lamb = eigenValues[i]
-            print(
-                formatString.format(
-                    lamb,
-                    comparisonResults[0][i],
-                    comparisonResults[1][i],
-                    comparisonResults[2][i],
-                    comparisonResults[3][i],
-                )
-            )
-            resultOther = comparisonResults[2][i]
-            tol = tolerances[i]
-            if abs(lamb - resultOther) > tol:
-                testOK = -1
-                print("failed->", abs(lamb - resultOther), tol)
-
-        assert testOK == 0
+        resultOther = comparisonResults[2][i]
+        tol = tolerances[i]
+        if abs(lamb - resultOther) > tol:
+            testOK = -1
+            print("failed->", abs(lamb - resultOther), tol)
+
+    return testOK
+
+
+@pytest.mark.parametrize("element", Elements)
+def test_EigenFrameExtra(element):
+    # calculate eigenvalues
+    numEigen = 3
+    eigenValues = buildModel(element).eigen(numEigen)
+    assert checkEigenvalues(eigenValues, f"element: {element}") == 0
+
+
+def test_FiberSection():
+    # The two-fiber section matches the discretized 2000-fiber section
+    eigenValues = []
+    for section in (fiberSection, rectangleSection):
+        model = FRAME.model()
+        section(model)
+        model.beamIntegration("Lobatto", 1, 1, nPts)
+        for eleTag, (end1, end2) in enumerate(FRAME.elements, 1):
+            model.element("forceBeamColumn", eleTag, end1, end2, 1, 1)
+        eigenValues.append(model.eigen(3))
+
+    for fiber, rectangle in zip(*eigenValues):
+        assert abs(fiber - rectangle) < 1e-6*rectangle
+
+
+solverTypes = [
+    "-genBandArpack",
+    "-fullGenLapack",
+]  # -UmfPack, -SuperLU and -ProfileSPD are not accepted by eigen
+
+@pytest.fixture(scope="module")
+def elasticFrame():
+    # every solver is applied to the same model
+    return buildModel("elasticBeam")
+
+
+@pytest.mark.parametrize("solverType", solverTypes)
+def test_EigenFrameSolver(elasticFrame, solverType):
+    numEigen = 3
+    eigenValues = elasticFrame.eigen(solverType, numEigen)
+    assert checkEigenvalues(eigenValues, f"solverType: {solverType}") == 0
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Run the Python examples of the gallery and the validation suite, and report
+their wall time, peak memory and exit status.
+
+Every ``.py`` file found under the given directories (by default
+``content/en/examples`` and ``content/validation``) is run in its own
+subprocess, from its own directory: ``test_*.py`` files through pytest, and
+all other files as scripts. The modules of the shared Library, and modules
+that other files of their directory import and that have no ``__main__``
+block, are not run.
+Scripts run with the non-interactive matplotlib backend so that figures do
+not block, in a session of their own so that a script that times out is
+killed together with any processes it started.
+
+Results are written to a JSON report. When the report already exists, the
+entries of scripts that passed are reused as long as their hash is
+unchanged. The hash covers the script, the Python and Tcl sources in its
+directory, any other file of its directory that it mentions by name, the
+shared Library modules, and the installed opensees version, so that an
+upgrade of opensees reruns everything.
+
+Usage:
+    python scripts/run-examples.py [-j N] [--timeout SECONDS] [--report PATH]
+                                   [--force] [-k PATTERN] [directories...]
+"""
+import os
+import re
+import sys
+import json
+import time
+import signal
+import hashlib
+import argparse
+import platform
+import threading
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = Path(__file__).resolve().parents[1]
+LIBRARY = ROOT/"content"/"en"/"examples"/"Library"
+DEFAULT_DIRS = [ROOT/"content"/"en"/"examples", ROOT/"content"/"validation"]
+
+# Files that are part of the test setup rather than examples
+SKIP = {"conftest.py"}
+
+
+def opensees_version():
+    try:
+        from importlib.metadata import version
+        return version("opensees")
+    except Exception:
+        return None
+
+
+def is_module(path):
+    """
+    Return True if ``path`` is a module of its directory rather than a
+    script: it has no ``__main__`` block, and another Python file of the
+    directory imports it.
+    """
+    if path.name.startswith("test_") or "__main__" in path.read_text(errors="replace"):
+        return False
+
+    imported = re.compile(rf"^\s*(from\s+{re.escape(path.stem)}\s+import|import\s+[\w\s,.]*\b{re.escape(path.stem)}\b)",
+                          re.MULTILINE)
+    return any(imported.search(other.read_text(errors="replace"))
+               for other in path.parent.glob("*.py") if other != path)
+
+
+def discover(directories, pattern=None):
+    """
+    Return the sorted list of example scripts and tests below ``directories``.
+    """
+    scripts = set()
+    for directory in directories:
+        for path in Path(directory).resolve().rglob("*.py"):
+            if path.name in SKIP or "__pycache__" in path.parts:
+                continue
+            # The shared modules are run through their tests only
+            if path.is_relative_to(LIBRARY) and not path.name.startswith("test_"):
+                continue
+            if pattern is not None and pattern not in str(path.relative_to(ROOT)):
+                continue
+            if is_module(path):
+                continue
+            scripts.add(path)
+    return sorted(scripts)
+
+
+def script_hash(script, environment):
+    """
+    Hash everything that can change the result of running ``script``.
+    """
+    source = script.read_bytes()
+    text = source.decode(errors="replace")
+
+    inputs = {script}
+    for path in script.parent.iterdir():
+        if not path.is_file():
+            continue
+        if path.suffix in (".py", ".tcl") or path.name in text:
+            inputs.add(path)
+    inputs.update(LIBRARY.glob("*.py"))
+
+    digest = hashlib.sha256(environment.encode())
+    for path in sorted(inputs):
+        digest.update(str(path.relative_to(ROOT)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def run(script, timeout, log_dir):
+    """
+    Run one script in a subprocess and return its exit status, wall time and
+    peak resident memory.
+    """
+    if script.name.startswith("test_"):
+        command = [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", script.name]
+    else:
+        command = [sys.executable, script.name]
+
+    env = dict(os.environ, MPLBACKEND="Agg")
+
+    log = log_dir/(str(script.relative_to(ROOT)).replace(os.sep, "__") + ".log")
+    with open(log, "wb") as output:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, cwd=script.parent, env=env,
+                                   stdin=subprocess.DEVNULL,
+                                   stdout=output, stderr=subprocess.STDOUT,
+                                   start_new_session=True)
+
+        # Kill the script's process group if it runs past the timeout; wait4
+        # then reports the resources used by this child alone
+        timed_out = threading.Event()
+
+        def kill():
+            timed_out.set()
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except OSError:
+                # The script (and its group) exited in the meantime
+                pass
+
+        timer = threading.Timer(timeout, kill)
+        timer.start()
+        _, status, usage = os.wait4(process.pid, 0)
+        timer.cancel()
+        wall_time = time.perf_counter() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    max_rss = usage.ru_maxrss / (1024**2 if sys.platform == "darwin" else 1024)
+
+    if timed_out.is_set():
+        result = "timeout"
+    else:
+        result = "passed" if process.returncode == 0 else "failed"
+
+    return {
+        "status":     result,
+        "returncode": process.returncode,
+        "wall_time":  round(wall_time, 3),
+        "max_rss_mb": round(max_rss, 1),
+        "log":        str(log.relative_to(ROOT)) if log.is_relative_to(ROOT) else str(log),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("directories", nargs="*", type=Path, default=DEFAULT_DIRS)
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="number of scripts run at once")
+    parser.add_argument("--timeout", type=float, default=600,
+                        help="seconds before a script is killed")
+    parser.add_argument("--report", type=Path, default=ROOT/"run-examples.json",
+                        help="JSON report, also used as the cache of earlier results")
+    parser.add_argument("--force", action="store_true",
+                        help="run every script, ignoring cached results")
+    parser.add_argument("-k", dest="pattern", default=None,
+                        help="only run scripts whose path contains PATTERN")
+    args = parser.parse_args()
+
+    version = opensees_version()
+    environment = f"{platform.python_version()} opensees {version}"
+
+    cached = {}
+    if args.report.exists() and not args.force:
+        cached = json.loads(args.report.read_text()).get("scripts", {})
+
+    log_dir = args.report.resolve().parent/(args.report.stem + "-logs")
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    scripts = discover(args.directories, args.pattern)
+    results = {}
+    pending = []
+    for script in scripts:
+        name = str(script.relative_to(ROOT))
+        digest = script_hash(script, environment)
+        previous = cached.get(name)
+        if previous is not None and previous["hash"] == digest and previous["status"] == "passed":
+            results[name] = dict(previous, cached=True)
+        else:
+            pending.append((name, script, digest))
+
+    print(f"{len(scripts)} scripts, {len(scripts) - len(pending)} unchanged, "
+          f"running {len(pending)} with {args.jobs} workers", file=sys.stderr)
+
+    def job(item):
+        name, script, digest = item
+        result = dict(run(script, args.timeout, log_dir), hash=digest, cached=False)
+        print(f"{result['status']:>8} {result['wall_time']:8.1f} s {result['max_rss_mb']:8.1f} MB  {name}",
+              file=sys.stderr)
+        return name, result
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        for name, result in pool.map(job, pending):
+            results[name] = result
+
+    # Keep the earlier results of scripts that were not selected this time
+    failed = [name for name, result in results.items() if result["status"] != "passed"]
+    for name, result in cached.items():
+        if name not in results and (ROOT/name).exists():
+            results[name] = result
+
+    report = {
+        "python":   platform.python_version(),
+        "opensees": version,
+        "scripts":  dict(sorted(results.items())),
+    }
+    args.report.write_text(json.dumps(report, indent=2) + "\n")
+
+    print(f"{len(scripts) - len(failed)} passed, {len(failed)} failed; report in {args.report}",
+          file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
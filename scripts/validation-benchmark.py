@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Time the validation suite against committed baselines and write a table
+of the results for each suite to a generated BENCHMARK.md.
+
+Each ``test_*.py`` file of a suite (a directory of ``content/validation``
+with a STATUS.md file) is run by pytest in its own directory, and the wall
+time of every test case is recorded through the ``--timings`` option of
+``content/conftest.py``. Each case is compared with its time in
+``content/validation/benchmarks.json``, and flagged when it is slower by
+more than ``--threshold`` percent (and by more than ``--min-delta``
+seconds, to ignore noise in very short cases). The status, time and
+baseline of each case are written to BENCHMARK.md in the suite directory,
+which is not committed. STATUS.md is left to the Tcl drivers, which append
+their results to it: a timing column there would change a committed file
+on every run and mix Python timings into the Tcl log, so the timings have
+a table of their own.
+
+Baselines are stored as multiples of the time of a calibration case, a
+fixed analysis run by this script before the suites, so that they carry
+over between machines. They are converted to seconds with the calibration
+time of the current machine before comparing.
+
+Usage:
+    python scripts/validation-benchmark.py [--threshold PERCENT] [--update] [suites...]
+
+With ``--update``, the baselines of passing cases are replaced by the new
+times, relative to the calibration case; commit the updated benchmarks.json
+to adopt them.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+CONTENT = ROOT/"content"
+VALIDATION = CONTENT/"validation"
+BASELINES = VALIDATION/"benchmarks.json"
+
+
+def calibration(repeat=5):
+    """
+    Return the shortest wall time of the calibration case among ``repeat``
+    runs: the static analysis of a cantilever of 50 elastic beam elements
+    under a tip load applied in 1000 steps.
+    """
+    import opensees.openseespy as ops
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        model = ops.Model(ndm=2, ndf=3)
+        model.geomTransf("Linear", 1)
+        for i in range(51):
+            model.node(i + 1, float(i), 0.0)
+        model.fix(1, 1, 1, 1)
+        for i in range(50):
+            model.element("ElasticBeamColumn", i + 1, (i + 1, i + 2), 1.0, 1000.0, 1.0, 1)
+        model.pattern("Plain", 1, "Linear", load={51: [0.0, -1.0, 0.0]})
+        model.system("BandGeneral")
+        model.test("NormDispIncr", 1e-10, 10)
+        model.algorithm("Newton")
+        model.integrator("LoadControl", 1/1000)
+        model.analysis("Static")
+        if model.analyze(1000) != 0:
+            raise RuntimeError("The calibration case failed")
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def suites():
+    """
+    Return the names of the suites, the directories holding a STATUS.md.
+    """
+    return sorted(path.parent.name for path in VALIDATION.glob("*/STATUS.md"))
+
+
+def run_file(test_file, suite_dir):
+    """
+    Run one test file and return {test id: (outcome, seconds)}, with test ids
+    relative to the suite directory.
+    """
+    prefix = test_file.parent.relative_to(suite_dir).as_posix()
+    prefix = "" if prefix == "." else prefix + "/"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        timings = Path(tmp)/"timings.json"
+        process = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider",
+             f"--confcutdir={CONTENT}", "--timings", str(timings), test_file.name],
+            cwd=test_file.parent, env=dict(os.environ, MPLBACKEND="Agg"),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        tests = json.loads(timings.read_text())["tests"] if timings.exists() else {}
+
+    results = {prefix + name: (test["outcome"], test["duration"]) for name, test in tests.items()}
+
+    # A file that fails to import reports no test cases
+    if not results and process.returncode not in (0, 5):
+        results[prefix + test_file.name] = ("error", 0.0)
+    return results
+
+
+def compare(results, baselines, threshold, min_delta):
+    """
+    Return the rows of a BENCHMARK table, and the ids of the failing and
+    slower test cases.
+    """
+    rows, failed, slower = [], [], []
+    for name, (outcome, seconds) in sorted(results.items()):
+        baseline = baselines.get(name)
+        notes = ""
+        if outcome != "passed":
+            failed.append(name)
+            notes = outcome
+        elif baseline is None:
+            notes = "no baseline"
+        elif seconds > baseline * (1 + threshold/100) and seconds - baseline > min_delta:
+            slower.append(name)
+            notes = f"SLOWER by {100*(seconds/baseline - 1):.0f}%"
+
+        status = "PASSED" if outcome == "passed" else "FAILED"
+        rows.append((status, name, f"{seconds:.3f}",
+                     "" if baseline is None else f"{baseline:.3f}", notes))
+    return rows, failed, slower
+
+
+def write_table(path, rows):
+    lines = ["| Status | Test | Time (s) | Baseline (s) | Notes |",
+             "|--------|------|---------:|-------------:|-------|"]
+    lines += [f"| {' | '.join(row)} |" for row in rows]
+    path.write_text("\n".join(lines) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("suites", nargs="*", default=None,
+                        help="suites to run (default: all with a STATUS.md)")
+    parser.add_argument("--threshold", type=float, default=25.0,
+                        help="percentage slowdown that is flagged")
+    parser.add_argument("--min-delta", type=float, default=0.05,
+                        help="seconds of slowdown below which cases are not flagged")
+    parser.add_argument("--update", action="store_true",
+                        help="store the times of passing cases as the new baselines")
+    args = parser.parse_args()
+
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+
+    unit = calibration()
+    print(f"Calibration case: {unit:.3f} s", file=sys.stderr)
+
+    any_failed = any_slower = False
+    for suite in args.suites or suites():
+        suite_dir = VALIDATION/suite
+        results = {}
+        for test_file in sorted(suite_dir.rglob("test_*.py")):
+            if "__pycache__" not in test_file.parts:
+                results.update(run_file(test_file, suite_dir))
+
+        suite_baselines = {name: ratio*unit for name, ratio in baselines.get(suite, {}).items()}
+        rows, failed, slower = compare(results, suite_baselines,
+                                       args.threshold, args.min_delta)
+        write_table(suite_dir/"BENCHMARK.md", rows)
+
+        print(f"{suite}: {len(results)} cases, {len(failed)} failed, {len(slower)} slower",
+              file=sys.stderr)
+        for name in failed + slower:
+            print(f"  {name}", file=sys.stderr)
+
+        any_failed = any_failed or bool(failed)
+        any_slower = any_slower or bool(slower)
+
+        if args.update:
+            baselines[suite] = dict(sorted(
+                (name, float(f"{seconds/unit:.4g}")) for name, (outcome, seconds) in results.items()
+                if outcome == "passed"
+            ))
+
+    if args.update:
+        BASELINES.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+
+    sys.exit(1 if any_failed or any_slower else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Run the validation cases that exist as both Tcl and Python scripts, compare
+the numbers they print, and report how long each interpreter takes.
+
+A pair is a ``.tcl`` file and, in the same directory, a ``.py`` file with the
+same name or with the name prefixed by ``test_`` (for example
+``PortalFrame2d.tcl`` and ``test_PortalFrame2d.py``). Tcl scripts are run by
+the opensees package (``python -m opensees``). Python scripts are run
+directly when they have a ``__main__`` block, and through ``pytest -s``
+otherwise. Each run happens in a copy of the script's directory in the
+system temporary directory, at the same path relative to the repository as
+the original and surrounded by links to the rest of the repository, so that
+paths relative to the script (such as to the shared Library) resolve as
+usual while files the scripts write (such as STATUS.md) are left untouched.
+
+The numbers printed by the two scripts are compared by position: the n-th
+line with numbers in the Tcl output is paired with the n-th such line in the
+Python output, and their values in order, each to within ``--rtol`` of the
+larger in magnitude (or ``--atol``). A pair whose outputs have a different
+number of such lines, or of values on paired lines, is an error. Words with
+digits (such as ``PortalFrame2d``) and the summary line of pytest are not
+counted.
+
+The time of a script is its best wall time among ``--repeat`` runs, less the
+best time of an empty script run the same way that only loads opensees, so
+that the startup of the interpreter, and the import and collection of pytest,
+are not charged to either side. The time ratio is the Python time over the
+Tcl time; a ratio above one means the Python model is slower.
+
+Usage:
+    python scripts/validation-parity.py [--repeat N] [--rtol RTOL] [--report PATH] [directories...]
+"""
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+VALIDATION = ROOT/"content"/"validation"
+
+# Directories of scripts kept for reference only
+SKIP = {"Legacy"}
+
+# Shortest time reported, in seconds
+_RESOLUTION = 1e-3
+
+_NUMBER = re.compile(r"(?<![\w.])[-+]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?(?![\w.])")
+
+_PYTEST_SUMMARY = re.compile(r"^=*\s*\d+ (passed|failed|error|errors|skipped|deselected|"
+                             r"xfailed|xpassed|warnings?)\b")
+
+
+def discover(directories):
+    """
+    Return the (tcl, python) pairs of scripts below ``directories``.
+    """
+    pairs = []
+    for directory in directories:
+        for tcl in sorted(Path(directory).resolve().rglob("*.tcl")):
+            if SKIP.intersection(tcl.parts):
+                continue
+            for name in (tcl.stem + ".py", "test_" + tcl.stem + ".py"):
+                python = tcl.with_name(name)
+                if python.exists():
+                    pairs.append((tcl, python))
+                    break
+    return pairs
+
+
+# Scripts that only load opensees, one of each kind, run like the scripts
+# of that kind to time the startup of their interpreter
+_EMPTY = {
+    "tcl":    ("empty.tcl",     "puts {}\n"),
+    "python": ("empty.py",      "import opensees.openseespy\n\nif __name__ == '__main__':\n    pass\n"),
+    "pytest": ("test_empty.py", "import opensees.openseespy\n\ndef test_empty():\n    pass\n"),
+}
+
+
+def kind(script):
+    if script.suffix == ".tcl":
+        return "tcl"
+    return "python" if "__main__" in script.read_text() else "pytest"
+
+
+def command(script):
+    return {
+        "tcl":    [sys.executable, "-m", "opensees", script.name],
+        "python": [sys.executable, script.name],
+        "pytest": [sys.executable, "-m", "pytest", "-q", "-s", "-p", "no:cacheprovider", script.name],
+    }[kind(script)]
+
+
+def mirror(directory, tmp):
+    """
+    Copy ``directory`` to its path relative to the repository below ``tmp``,
+    and link every other entry of its parent directories up to the root of
+    the repository, so that the copy sees the same files around it as the
+    original. Return the copy.
+    """
+    workdir = tmp/directory.relative_to(ROOT)
+    shutil.copytree(directory, workdir, ignore=shutil.ignore_patterns("__pycache__"))
+
+    child = directory
+    while child != ROOT:
+        for entry in child.parent.iterdir():
+            if entry != child:
+                (tmp/entry.relative_to(ROOT)).symlink_to(entry, entry.is_dir())
+        child = child.parent
+    return workdir
+
+
+def run(script, repeat, copy=True):
+    """
+    Run ``script`` ``repeat`` times, each time in a fresh copy of its
+    directory (see ``mirror``) unless ``copy`` is False, and return its
+    output, exit status, and shortest wall time.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="parity-") as tmp:
+            workdir = mirror(script.parent, Path(tmp)) if copy else script.parent
+            start = time.perf_counter()
+            process = subprocess.run(command(script), cwd=workdir,
+                                     env=dict(os.environ, MPLBACKEND="Agg"),
+                                     stdin=subprocess.DEVNULL,
+                                     capture_output=True, text=True)
+            best = min(best, time.perf_counter() - start)
+    return process.stdout + process.stderr, process.returncode, best
+
+
+def startup_times(repeat):
+    """
+    Return the shortest wall time of an empty script of each kind, by kind.
+    """
+    times = {}
+    with tempfile.TemporaryDirectory(prefix="parity-") as tmp:
+        for name, (file, text) in _EMPTY.items():
+            script = Path(tmp)/file
+            script.write_text(text)
+            output, status, times[name] = run(script, repeat, copy=False)
+            if status != 0:
+                raise RuntimeError(f"The empty {name} script failed:\n{output}")
+    return times
+
+
+def numbers(output):
+    """
+    Return the numbers in ``output`` as a list of lists, one for each line
+    that has any.
+    """
+    lines = []
+    for line in output.splitlines():
+        if _PYTEST_SUMMARY.match(line.strip()):
+            continue
+        values = [float(match.group()) for match in _NUMBER.finditer(line)]
+        if values:
+            lines.append(values)
+    return lines
+
+
+def compare(tcl_output, python_output, rtol, atol=0.0):
+    """
+    Compare the numbers printed by Tcl and Python by position, and return a
+    list of the differences and an error message, which is None when both
+    print the same number of values on the same number of lines.
+    """
+    tcl_lines, python_lines = numbers(tcl_output), numbers(python_output)
+    if len(tcl_lines) != len(python_lines):
+        return [], (f"{len(tcl_lines)} lines with numbers in Tcl output, "
+                    f"{len(python_lines)} in Python output")
+
+    differences = []
+    for line, (tcl_values, python_values) in enumerate(zip(tcl_lines, python_lines), start=1):
+        if len(tcl_values) != len(python_values):
+            return differences, (f"line {line} with numbers has {len(tcl_values)} values "
+                                 f"in Tcl output, {len(python_values)} in Python output")
+        for tcl_value, python_value in zip(tcl_values, python_values):
+            scale = max(abs(tcl_value), abs(python_value))
+            if abs(tcl_value - python_value) > max(rtol*scale, atol):
+                differences.append({"line": line, "tcl": tcl_value, "python": python_value})
+    return differences, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("directories", nargs="*", type=Path, default=[VALIDATION])
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="number of runs of each script; the shortest is reported")
+    parser.add_argument("--rtol", type=float, default=1e-3,
+                        help="relative tolerance on printed numbers")
+    parser.add_argument("--atol", type=float, default=0.0,
+                        help="absolute tolerance on printed numbers, for values near zero")
+    parser.add_argument("--report", type=Path, default=None,
+                        help="write the results to a JSON file")
+    args = parser.parse_args()
+
+    startup = startup_times(args.repeat)
+
+    results = {}
+    print(f"{'Tcl (s)':>9} {'Python (s)':>11} {'Ratio':>6}  {'Parity':<8} Pair")
+    for tcl, python in discover(args.directories):
+        tcl_output,    tcl_status,    tcl_time    = run(tcl,    args.repeat)
+        python_output, python_status, python_time = run(python, args.repeat)
+
+        # Charge neither side for starting its interpreter and loading opensees
+        tcl_time    = max(tcl_time    - startup[kind(tcl)],    _RESOLUTION)
+        python_time = max(python_time - startup[kind(python)], _RESOLUTION)
+        differences, error = compare(tcl_output, python_output, args.rtol, args.atol)
+
+        if tcl_status != 0 or python_status != 0:
+            parity = "error"
+            error = error or f"exit status {tcl_status} (Tcl), {python_status} (Python)"
+        elif error is not None:
+            parity = "error"
+        else:
+            parity = "ok" if not differences else "differ"
+
+        name = str(tcl.relative_to(ROOT).with_suffix(""))
+        results[name] = {
+            "tcl":         str(tcl.relative_to(ROOT)),
+            "python":      str(python.relative_to(ROOT)),
+            "parity":      parity,
+            "tcl_status":  tcl_status,
+            "python_status": python_status,
+            "tcl_time":    round(tcl_time, 3),
+            "python_time": round(python_time, 3),
+            "ratio":       round(python_time/tcl_time, 2),
+            "error":       error,
+            "differences": differences[:20],
+        }
+        print(f"{tcl_time:9.2f} {python_time:11.2f} {python_time/tcl_time:6.2f}  {parity:<8} {name}")
+
+    if args.report is not None:
+        args.report.write_text(json.dumps(results, indent=2) + "\n")
+
+    sys.exit(0 if all(result["parity"] == "ok" for result in results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()